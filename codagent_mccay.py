@@ -140,6 +140,8 @@ MINIMUM_TEMP = 0.8
 MAXIMUM_TEMP = 1.4
 BRAINCOOLDOWNLEVEL = 10
 SCORESTRING = '37&8<<<.*?>>>'
+# Escape sequences and (multiline) prompts purged from MUD output in one pass
+RECENTBUF_PURGE_RE = re.compile(r'\x1b\[.*?n|(?s:37&8.*?37&6)')
 score = 0
 actions = 0
 futility = 0
@@ -932,8 +934,7 @@ def append_recentbuffer(thistext):
 
     client = OpenAI()
 
-    thistext = re.sub(r'\x1b\[.*?n', '', thistext) #purge escape sequences  
-    thistext = re.sub(r'37&8.*?37&6', '', thistext, flags=re.DOTALL) #purge prompts. re.DOTALL allows multiline
+    thistext = RECENTBUF_PURGE_RE.sub('', thistext) #purge escape sequences and prompts
 
     recentbuffer = recentbuffer + thistext
 
@@ -1121,7 +1122,12 @@ def _scheduled_pdf_worker():
                                             "Identify and return only the complete Abstract section from the following OCR extracted text."
                                         ),
                                     },
-                                    {"role": "user", "content": raw_text[:20000]},
+                                    {
+                                        "role": "user",
+                                        "content": fft._truncate_tokens(
+                                            raw_text, fft._ABSTRACT_PROMPT_TOKENS
+                                        ),
+                                    },
                                 ]
 
                                 try:
@@ -1215,7 +1221,12 @@ def _manual_pdf_worker():
                                     "Identify and return only the complete Abstract section from the following OCR extracted text."
                                 ),
                             },
-                            {"role": "user", "content": raw_text[:20000]},
+                            {
+                                "role": "user",
+                                "content": fft._truncate_tokens(
+                                    raw_text, fft._ABSTRACT_PROMPT_TOKENS
+                                ),
+                            },
                         ]
 
                         try:
@@ -14,16 +14,20 @@ print(recent)
 from __future__ import annotations
 
 import datetime as _dt
+import functools
 import xml.etree.ElementTree as _ET
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, TYPE_CHECKING
-from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, TYPE_CHECKING
+from collections import Counter, OrderedDict
+import fcntl
 import json
 
 import os
 import re
 import urllib.parse
+import urllib.error
 import urllib.request
+import urllib.response
 
 import openai
 from models import SPEAKING_MODEL, THINKING_MODEL, FETCH_MODEL
@@ -33,12 +37,36 @@ import shlex
 import time
 import random
 import shutil
+import sqlite3
 import tempfile
 import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import gzip
+import http.client
+import http.cookiejar
+import io
+from html.parser import HTMLParser
+import hashlib
+import zlib
 
 import feedparser as _fp
 
+try:  # optional brotli dependency for compressed HTTP responses
+    import brotli as _brotli
+except Exception:  # pragma: no cover - brotli unavailable
+    _brotli = None
+
+try:  # optional orjson dependency for faster article store reads and writes
+    import orjson as _orjson
+except Exception:  # pragma: no cover - orjson unavailable
+    _orjson = None
+
+try:  # optional tiktoken dependency for sizing LLM prompts by tokens
+    import tiktoken as _tiktoken
+except Exception:  # pragma: no cover - tiktoken unavailable
+    _tiktoken = None
+
 if TYPE_CHECKING:
     from docling.document_converter import DocumentConverter
     from docling.datamodel.document import ConversionResult
@@ -47,10 +75,63 @@ _BASE_DIR = Path(__file__).resolve().parent
 _PDF_DIR = (_BASE_DIR / "../pdfs").resolve()
 _ARTICLES_JSON = _PDF_DIR / "articles.json"
 
+# Failed PDF downloads are not retried by ``fetch_recent_articles`` until this
+# much time has passed since the recorded ``last_attempt``.
+_RETRY_BACKOFF = _dt.timedelta(hours=24)
+
 _DOC_CONVERTER: "DocumentConverter | None" = None
 _DOC_CONVERTER_FAILED = False
 _DOC_CONVERTER_LOCK = threading.Lock()
 
+_OPENAI_CLIENT: "openai.OpenAI | None" = None
+_OPENAI_CLIENT_LOCK = threading.Lock()
+
+# Set DANMCCAY_DEBUG_HTML=1 to dump every page given to the LLM browser (and
+# its reduced link list) under /tmp for inspection.
+_DEBUG_HTML = os.environ.get("DANMCCAY_DEBUG_HTML") == "1"
+
+# Progress messages from ``_debug`` are on by default; FEEDFETCH_DEBUG=0
+# silences them and skips their formatting entirely.
+_DEBUG = os.environ.get("FEEDFETCH_DEBUG", "1") != "0"
+
+# Feed downloads spend nearly all their time waiting on sockets, so they are
+# fetched on a small thread pool; Fight Aging! posts, which each need one or
+# two LLM round trips, are resolved the same way.
+_FEED_WORKERS = 8
+_LLM_WORKERS = 8
+# Experiment designs are long (up to 20k token) generations; a few run at once.
+_DESIGN_WORKERS = 4
+
+# PDF downloads run this many at a time; requests to the same publisher are
+# still spaced out by a random delay (seconds).
+_DOWNLOAD_WORKERS = 6
+_DOWNLOAD_DELAY = (5, 10)
+
+# Docling runs its OCR and layout models on this many threads per document
+# (its own default is 4).
+_OCR_THREADS = os.cpu_count() or 4
+
+
+def _docling_format_options(input_format) -> Dict[Any, Any] | None:
+    """Return PDF options running Docling on :data:`_OCR_THREADS` threads.
+
+    ``None`` keeps Docling's defaults on versions without these options."""
+
+    try:
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.document_converter import PdfFormatOption
+
+        try:
+            from docling.datamodel.accelerator_options import AcceleratorOptions
+        except ImportError:
+            from docling.datamodel.pipeline_options import AcceleratorOptions
+    except ImportError:
+        return None
+
+    options = PdfPipelineOptions()
+    options.accelerator_options = AcceleratorOptions(num_threads=_OCR_THREADS)
+    return {input_format.PDF: PdfFormatOption(pipeline_options=options)}
+
 
 def _get_docling_converter() -> "DocumentConverter | None":
     """Initialise and cache a Docling ``DocumentConverter``."""
@@ -73,7 +154,10 @@ def _get_docling_converter() -> "DocumentConverter | None":
             return None
 
         try:
-            _DOC_CONVERTER = DocumentConverter(allowed_formats=[InputFormat.PDF])
+            _DOC_CONVERTER = DocumentConverter(
+                allowed_formats=[InputFormat.PDF],
+                format_options=_docling_format_options(InputFormat),
+            )
         except Exception as exc:  # pragma: no cover - defensive logging
             print(f"[OCR] Failed to initialise Docling: {exc}")
             _DOC_CONVERTER_FAILED = True
@@ -82,6 +166,71 @@ def _get_docling_converter() -> "DocumentConverter | None":
         return _DOC_CONVERTER
 
 
+def _openai_client() -> "openai.OpenAI":
+    """Return a shared OpenAI client so HTTP keep-alive connections are reused."""
+
+    global _OPENAI_CLIENT
+
+    with _OPENAI_CLIENT_LOCK:
+        if _OPENAI_CLIENT is None:
+            _OPENAI_CLIENT = openai.OpenAI()
+        return _OPENAI_CLIENT
+
+
+def _stream_chat(client: "openai.OpenAI", **kwargs) -> str:
+    """Run a chat completion with streaming and return the generated text.
+
+    Long generations arrive incrementally instead of after one long blocking
+    read."""
+
+    resp = client.chat.completions.create(stream=True, **kwargs)
+    parts = []
+    for chunk in resp:
+        if chunk.choices:
+            parts.append(chunk.choices[0].delta.content or "")
+    return "".join(parts)
+
+
+# Prompt budgets, in tokens.  Without tiktoken a token is taken as four
+# characters, which is close for English text.
+_ABSTRACT_PROMPT_TOKENS = 5000
+_SUMMARY_CHUNK_TOKENS = 12000
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=4)
+def _token_encoding(model: str):
+    try:
+        return _tiktoken.encoding_for_model(model)
+    except KeyError:
+        return _tiktoken.get_encoding("o200k_base")
+
+
+def _count_tokens(text: str, model: str = SPEAKING_MODEL) -> int:
+    """Return the (estimated, without tiktoken) number of tokens in *text*."""
+
+    if _tiktoken is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(_token_encoding(model).encode(text, disallowed_special=()))
+
+
+def _truncate_tokens(text: str, max_tokens: int, model: str = SPEAKING_MODEL) -> str:
+    """Return the leading part of *text* that fits in *max_tokens* tokens."""
+
+    if _tiktoken is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    encoding = _token_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+# The exported document holds a record (with bounding boxes) for every text
+# cell; pretty-printing it mostly adds indentation to what gets archived.
+_DOCLING_JSON_FORMAT = {"separators": (",", ":"), "ensure_ascii": False}
+
+
 def _docling_conversion_payload(
     conversion: "ConversionResult",
 ) -> tuple[str, Dict[str, str]]:
@@ -122,7 +271,7 @@ def _docling_conversion_payload(
         doc_dict = _export_dict(document)
         if doc_dict is not None:
             attachments["docling_document.json"] = json.dumps(
-                _json_safe_copy(doc_dict), indent=2, ensure_ascii=False
+                _json_safe_copy(doc_dict), **_DOCLING_JSON_FORMAT
             )
 
     if not raw_text:
@@ -135,7 +284,7 @@ def _docling_conversion_payload(
             legacy_dict = _export_dict(legacy_doc)
             if legacy_dict is not None and "docling_document.json" not in attachments:
                 attachments["docling_document.json"] = json.dumps(
-                    _json_safe_copy(legacy_dict), indent=2, ensure_ascii=False
+                    _json_safe_copy(legacy_dict), **_DOCLING_JSON_FORMAT
                 )
 
     metadata = {
@@ -150,9 +299,17 @@ def _docling_conversion_payload(
     return raw_text, attachments
 
 
-def _debug(message: str) -> None:
-    """Emit a timestamped debug message for troubleshooting."""
+def _debug(message: str, **fields) -> None:
+    """Emit a timestamped debug message for troubleshooting.
+
+    *message* is formatted with *fields* only when debug output is enabled
+    (``FEEDFETCH_DEBUG=0`` turns it off), so callers pass raw values rather
+    than pre-formatted strings."""
 
+    if not _DEBUG:
+        return
+    if fields:
+        message = message.format(**fields)
     timestamp = _dt.datetime.now().isoformat(timespec="seconds")
     print(f"[feedfetchtest {timestamp}] {message}")
 
@@ -162,27 +319,486 @@ if not _ARTICLES_JSON.is_file():
     _ARTICLES_JSON.write_text("{}", encoding="utf-8")
 
 
+_HTTP_POOL = threading.local()
+
+# Errors showing that a pooled connection was closed by the server while it
+# sat idle.  Only these, raised before any response arrived, are retried on a
+# fresh socket, and only for requests that are safe to send twice.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+_RETRY_METHODS = ("GET", "HEAD")
+
+
+class _KeepAliveMixin:
+    """Reuse one persistent connection per host and thread for ``urlopen``.
+
+    urllib closes the socket after every request, so each page, redirect hop
+    and CrossRef lookup pays a fresh TCP/TLS handshake.  Here connections are
+    kept per thread and the body is read eagerly so the socket is always
+    clean for the next request; a GET or HEAD on a connection the server
+    dropped while idle is retried on a new socket.
+
+    With *max_page_bytes* set, bodies that are not PDFs are cut off after
+    that many bytes (and their connection is dropped rather than reused)."""
+
+    def __init__(self, *args, max_page_bytes: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_page_bytes = max_page_bytes
+
+    def _read_body(self, r) -> tuple[bytes, bool]:
+        """Return ``(body, truncated)`` for response *r*."""
+
+        if self.max_page_bytes is None:
+            return r.read(), False
+        head = r.read(8)
+        if head.startswith(b"%PDF") or r.msg.get_content_type() == "application/pdf":
+            return head + r.read(), False
+        body = head + r.read(max(self.max_page_bytes - len(head), 0))
+        return body, not r.isclosed()
+
+    def _pooled_open(self, http_class, req, **conn_args):
+        if req._tunnel_host:
+            # Proxied requests keep urllib's one-shot behaviour.
+            return self.do_open(http_class, req, **conn_args)
+        host = req.host
+        if not host:
+            raise urllib.error.URLError("no host given")
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers["Connection"] = "keep-alive"
+        headers = {name.title(): val for name, val in headers.items()}
+
+        pool = getattr(_HTTP_POOL, "connections", None)
+        if pool is None:
+            pool = _HTTP_POOL.connections = {}
+        key = (http_class.__name__, host)
+        while True:
+            conn = pool.pop(key, None)
+            reused = conn is not None
+            if conn is None:
+                conn = http_class(host, timeout=req.timeout, **conn_args)
+            r = None
+            try:
+                conn.request(
+                    req.get_method(),
+                    req.selector,
+                    req.data,
+                    headers,
+                    encode_chunked=req.has_header("Transfer-encoding"),
+                )
+                r = conn.getresponse()
+                body, truncated = self._read_body(r)
+            except (http.client.HTTPException, OSError) as err:
+                conn.close()
+                if (
+                    reused
+                    and r is None
+                    and req.get_method() in _RETRY_METHODS
+                    and isinstance(err, _STALE_CONNECTION_ERRORS)
+                ):
+                    continue
+                raise urllib.error.URLError(err)
+            break
+
+        if r.will_close or truncated:
+            conn.close()
+        else:
+            pool[key] = conn
+        resp = urllib.response.addinfourl(
+            io.BytesIO(body), r.msg, req.get_full_url(), r.status
+        )
+        resp.msg = r.reason
+        return resp
+
+
+class _KeepAliveHTTPHandler(_KeepAliveMixin, urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self._pooled_open(http.client.HTTPConnection, req)
+
+
+class _KeepAliveHTTPSHandler(_KeepAliveMixin, urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self._pooled_open(
+            http.client.HTTPSConnection, req, context=self._context
+        )
+
+
 def _build_http_opener():
     return urllib.request.build_opener(
         urllib.request.HTTPRedirectHandler(),
+        _KeepAliveHTTPHandler(),
+        _KeepAliveHTTPSHandler(),
     )
 
 
 _HTTP_OPENER = _build_http_opener()
 urllib.request.install_opener(_HTTP_OPENER)
 
+# Pages (not PDFs) fetched by the browsing loop are cut off at this size; the
+# LLM only ever sees the links, and heavy publisher pages can run to many MB
+# of inline scripts.
+_BROWSE_PAGE_LIMIT = 1024 * 1024
+
+_BROWSE_OPENER: "urllib.request.OpenerDirector | None" = None
+_BROWSE_OPENER_LOCK = threading.Lock()
+
+
+def _browse_opener() -> "urllib.request.OpenerDirector":
+    """Return the cookie-carrying opener used by the LLM browsing loop.
+
+    It starts from the same institutional cookie jar as the curl fetch script
+    (``PDF_FETCH_COOKIE_JAR`` or ``pdfs/jar.cookies``) and keeps any cookies
+    set by publishers for the rest of the process."""
+
+    global _BROWSE_OPENER
+    with _BROWSE_OPENER_LOCK:
+        if _BROWSE_OPENER is None:
+            jar = http.cookiejar.MozillaCookieJar()
+            jar_path = os.environ.get("PDF_FETCH_COOKIE_JAR") or str(
+                _PDF_DIR / "jar.cookies"
+            )
+            try:
+                jar.load(jar_path, ignore_discard=True, ignore_expires=True)
+            except FileNotFoundError:
+                pass
+            except (OSError, http.cookiejar.LoadError) as exc:
+                print(f"Could not load cookie jar {jar_path}: {exc}")
+            _BROWSE_OPENER = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(jar),
+                urllib.request.HTTPRedirectHandler(),
+                _KeepAliveHTTPHandler(max_page_bytes=_BROWSE_PAGE_LIMIT),
+                _KeepAliveHTTPSHandler(max_page_bytes=_BROWSE_PAGE_LIMIT),
+            )
+        return _BROWSE_OPENER
+
+
+def _browse_fetch(url: str) -> tuple[bytes, str, str]:
+    """Fetch *url* in-process for the browsing loop.
+
+    Returns ``(body, content_type, final_url)``.  Error pages are returned
+    like any other page, matching what curl hands back, so the LLM can still
+    pick a way forward from them."""
+
+    req = urllib.request.Request(url, headers=_HTTP_HEADERS)
+    try:
+        resp = _browse_opener().open(req, timeout=30)
+    except urllib.error.HTTPError as err:
+        resp = err
+    with resp:
+        return _read_response(resp), resp.headers.get_content_type(), resp.geturl()
+
 _HTTP_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (X11; Linux x86_64; rv:126.0) "
         "Gecko/20100101 Firefox/126.0"
     ),
     "Accept": "*/*",
+    "Accept-Encoding": "gzip, deflate" + (", br" if _brotli is not None else ""),
 }
 
 
+def _open_url(url: str):
+    """Open *url* with the module's browser-like, compression-enabled headers.
+
+    feedparser already negotiates gzip for feed downloads; this covers the
+    article pages and CrossRef lookups fetched directly with urllib."""
+
+    return urllib.request.urlopen(urllib.request.Request(url, headers=_HTTP_HEADERS))
+
+
+# Publisher pages are also kept on disk between runs, since scheduled runs
+# revisit the same articles.  Set SKIP_HTTP_CACHE=1 to bypass it.
+_HTTP_CACHE_DB: Path | None = (
+    None if os.environ.get("SKIP_HTTP_CACHE") == "1" else _PDF_DIR / "http_cache.sqlite"
+)
+_HTTP_CACHE_TTL = _dt.timedelta(days=7)
+# CrossRef metadata rarely changes, so it is kept for longer.
+_CROSSREF_CACHE_TTL = _dt.timedelta(days=30)
+# Replies to the short extraction prompts (DOI and primary link lookups),
+# which are asked again whenever a run revisits the same post.
+_LLM_CACHE_TTL = _dt.timedelta(days=30)
+_HTTP_CACHE_READY: set[Path] = set()
+_HTTP_CACHE_LOCK = threading.Lock()
+
+
+def _http_cache_connect(db: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db), timeout=30)
+    with _HTTP_CACHE_LOCK:
+        if db not in _HTTP_CACHE_READY:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS pages ("
+                    "url TEXT PRIMARY KEY, fetched REAL, final TEXT, body TEXT)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS crossref ("
+                    "url TEXT PRIMARY KEY, fetched REAL, json TEXT)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm ("
+                    "key TEXT PRIMARY KEY, fetched REAL, reply TEXT)"
+                )
+                conn.execute(
+                    "DELETE FROM pages WHERE fetched < ?",
+                    (time.time() - _HTTP_CACHE_TTL.total_seconds(),),
+                )
+                conn.execute(
+                    "DELETE FROM crossref WHERE fetched < ?",
+                    (time.time() - _CROSSREF_CACHE_TTL.total_seconds(),),
+                )
+                conn.execute(
+                    "DELETE FROM llm WHERE fetched < ?",
+                    (time.time() - _LLM_CACHE_TTL.total_seconds(),),
+                )
+            _HTTP_CACHE_READY.add(db)
+    return conn
+
+
+def _http_cache_get(url: str) -> tuple[str, str] | None:
+    """Return a fresh ``(final_url, text)`` stored for *url*, if any."""
+
+    db = _HTTP_CACHE_DB
+    if db is None:
+        return None
+    try:
+        conn = _http_cache_connect(db)
+        try:
+            row = conn.execute(
+                "SELECT final, body FROM pages WHERE url = ? AND fetched >= ?",
+                (url, time.time() - _HTTP_CACHE_TTL.total_seconds()),
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        print(f"HTTP cache lookup failed: {exc}")
+        return None
+    return (row[0], row[1]) if row else None
+
+
+def _http_cache_put(url: str, final: str, text: str) -> None:
+    db = _HTTP_CACHE_DB
+    if db is None:
+        return
+    try:
+        conn = _http_cache_connect(db)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                    (url, time.time(), final, text),
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        print(f"HTTP cache write failed: {exc}")
+
+
+def _crossref_json(api_url: str) -> dict:
+    """Return the decoded CrossRef response for *api_url*.
+
+    Responses are kept in the on-disk HTTP cache for
+    :data:`_CROSSREF_CACHE_TTL`.  A 404 (an unknown DOI) is cached as an
+    empty mapping so repeated lookups of bad DOIs cost nothing; other
+    failures raise and are not cached."""
+
+    db = _HTTP_CACHE_DB
+    if db is not None:
+        try:
+            conn = _http_cache_connect(db)
+            try:
+                row = conn.execute(
+                    "SELECT json FROM crossref WHERE url = ? AND fetched >= ?",
+                    (api_url, time.time() - _CROSSREF_CACHE_TTL.total_seconds()),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"CrossRef cache lookup failed: {exc}")
+            row = None
+        if row is not None:
+            return _parse_store(row[0]) if row[0] else {}
+
+    try:
+        with _open_url(api_url) as resp:
+            raw = _read_response(resp)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 404:
+            raise
+        raw = b""
+    data = _parse_store(raw) if raw else {}
+
+    if db is not None:
+        try:
+            conn = _http_cache_connect(db)
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO crossref VALUES (?, ?, ?)",
+                        (api_url, time.time(), raw.decode("utf-8", errors="ignore")),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"CrossRef cache write failed: {exc}")
+    return data
+
+
+def _chat_reply_cached(client: "openai.OpenAI", **kwargs) -> str:
+    """Return the reply to a chat completion, reusing an identical earlier one.
+
+    Replies are kept in the on-disk HTTP cache for :data:`_LLM_CACHE_TTL`,
+    keyed by a hash of the request arguments.  Only use this for prompts
+    whose answer is a fact about their input.  Failures raise and are not
+    cached."""
+
+    db = _HTTP_CACHE_DB
+    key = hashlib.blake2b(
+        json.dumps(kwargs, sort_keys=True, default=str).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    if db is not None:
+        try:
+            conn = _http_cache_connect(db)
+            try:
+                row = conn.execute(
+                    "SELECT reply FROM llm WHERE key = ? AND fetched >= ?",
+                    (key, time.time() - _LLM_CACHE_TTL.total_seconds()),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"LLM cache lookup failed: {exc}")
+            row = None
+        if row is not None:
+            return row[0]
+
+    resp = client.chat.completions.create(**kwargs)
+    reply = resp.choices[0].message.content or ""
+
+    if db is not None and reply:
+        try:
+            conn = _http_cache_connect(db)
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm VALUES (?, ?, ?)",
+                        (key, time.time(), reply),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"LLM cache write failed: {exc}")
+    return reply
+
+
+# Recently fetched pages kept in memory, oldest first.  The helpers that read
+# one entry's page run within moments of each other, so a small, short-lived
+# memo is enough; the on-disk cache carries pages across runs.
+_PAGE_MEMO: OrderedDict[str, tuple[float, tuple[str, str]]] = OrderedDict()
+_PAGE_MEMO_LOCK = threading.Lock()
+_PAGE_MEMO_SIZE = 64
+_PAGE_MEMO_TTL = 15 * 60  # seconds
+
+
+def _fetch_url_cached(url: str) -> tuple[str, str]:
+    """Return ``(final_url, text)`` for *url*, fetching each page only once.
+
+    Publisher pages are consulted by several helpers for the same entry (DOI,
+    journal title, Fight Aging! link resolution); sharing one download avoids
+    fetching the same page two or three times.  Pages are also served from
+    the on-disk cache for :data:`_HTTP_CACHE_TTL`.  Failures raise and are
+    not cached, so a later call retries."""
+
+    now = time.monotonic()
+    with _PAGE_MEMO_LOCK:
+        hit = _PAGE_MEMO.get(url)
+        if hit is not None and now - hit[0] < _PAGE_MEMO_TTL:
+            _PAGE_MEMO.move_to_end(url)
+            return hit[1]
+
+    page = _http_cache_get(url)
+    if page is None:
+        with _open_url(url) as resp:
+            final = resp.geturl()
+            text = _read_response(resp).decode("utf-8", errors="ignore")
+        _http_cache_put(url, final, text)
+        page = (final, text)
+
+    with _PAGE_MEMO_LOCK:
+        _PAGE_MEMO[url] = (now, page)
+        _PAGE_MEMO.move_to_end(url)
+        while len(_PAGE_MEMO) > _PAGE_MEMO_SIZE:
+            _PAGE_MEMO.popitem(last=False)
+    return page
+
+
+def _read_response(resp) -> bytes:
+    """Return the body of *resp*, decoding any ``Content-Encoding``."""
+
+    data = resp.read()
+    headers = getattr(resp, "headers", None)
+    encoding = (headers.get("Content-Encoding", "") if headers is not None else "")
+    encoding = encoding.strip().lower()
+    if not encoding or encoding == "identity":
+        return data
+    if encoding in {"gzip", "x-gzip"}:
+        try:
+            return gzip.decompress(data)
+        except (EOFError, OSError, zlib.error):
+            # A body cut short (e.g. a capped page): keep what decodes.
+            return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompressobj().decompress(data)
+        except zlib.error:
+            return zlib.decompressobj(-zlib.MAX_WBITS).decompress(data)
+    if encoding == "br" and _brotli is not None:
+        try:
+            return _brotli.decompress(data)
+        except _brotli.error:
+            return _brotli.Decompressor().process(data)
+    return data
+
+
+def _parallel_map(func, items, workers: int = _FEED_WORKERS) -> list:
+    """Return ``[func(item) for item in items]`` computed on a thread pool.
+
+    Results keep the order of *items*; the first exception raised by *func*
+    propagates to the caller just as it would from the sequential loop."""
+
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+_JSON_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
+
+
 def _json_safe_copy(value):
     """Return *value* converted to JSON-serializable Python primitives."""
 
+    # Exact-type fast paths: article records are almost entirely plain dicts
+    # of strings, so skip the isinstance chain and the per-leaf recursion.
+    value_type = type(value)
+    if value_type in _JSON_PRIMITIVES:
+        return value
+    if value_type is dict:
+        return {
+            key if type(key) is str else str(key): (
+                val if type(val) in _JSON_PRIMITIVES else _json_safe_copy(val)
+            )
+            for key, val in value.items()
+        }
+    if value_type is list:
+        return [
+            item if type(item) in _JSON_PRIMITIVES else _json_safe_copy(item)
+            for item in value
+        ]
     if isinstance(value, (str, int, float, bool)) or value is None:
         return value
     if isinstance(value, Path):
@@ -198,23 +814,143 @@ def _json_safe_copy(value):
     return str(value)
 
 
+def _load_articles(path: Path | None) -> Dict[str, dict]:
+    """Return the article store at *path*, or an empty mapping if unreadable."""
+
+    if path is None:
+        return {}
+    try:
+        data = _parse_store(Path(path).read_bytes())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _recently_attempted(data: dict, now: _dt.datetime) -> bool:
+    """Return ``True`` if *data* records a failed download newer than the backoff."""
+
+    if data.get("download_successful") is not False:
+        return False
+    last_attempt = data.get("last_attempt")
+    if not last_attempt:
+        return False
+    try:
+        attempted = _dt.datetime.fromisoformat(last_attempt)
+    except (TypeError, ValueError):
+        return False
+    if attempted.tzinfo is None:
+        attempted = attempted.replace(tzinfo=_dt.timezone.utc)
+    return now - attempted < _RETRY_BACKOFF
+
+
+def _dump_store(data: dict) -> bytes:
+    """Serialise the article store as sorted, two-space indented JSON."""
+
+    if _orjson is not None:
+        return _orjson.dumps(data, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+
+
+def _parse_store(raw: bytes):
+    """Parse JSON *raw* (the article store, CrossRef replies), using orjson when available."""
+
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            # orjson rejects NaN and lone surrogate escapes, which json writes.
+            pass
+    return json.loads(raw)
+
+
+# Parsed stores keyed by path, each with the (mtime, size, inode) it was read
+# at, an index of article keys by lower-cased journal name and a map from
+# each article's ``doi`` field to its key.
+_ARTICLES_CACHE: Dict[
+    Path, tuple[tuple[int, int, int], dict, Dict[str, list[str]], Dict[str, str]]
+] = {}
+_ARTICLES_CACHE_LOCK = threading.Lock()
+
+
+def _store_stamp(path: Path) -> tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _load_articles_cached(path: Path) -> dict:
+    """Return the parsed store at *path*, re-reading it only when it changed.
+
+    The mapping is shared between callers and must not be modified; code that
+    updates articles should load its own copy.  Missing or malformed files
+    raise as they would from :func:`json.load`."""
+
+    return _cached_store(Path(path))[1]
+
+
+def _journal_index(path: Path) -> Dict[str, list[str]]:
+    """Return the keys of the articles at *path* grouped by lower-cased journal.
+
+    Built together with the cached store, so repeated per-journal queries do
+    not each walk every article."""
+
+    return _cached_store(Path(path))[2]
+
+
+def _doi_index(path: Path) -> Dict[str, str]:
+    """Return a map from the ``doi`` field of the articles at *path* to their key.
+
+    The first article listing a DOI wins, matching a scan in store order."""
+
+    return _cached_store(Path(path))[3]
+
+
+def _cached_store(path: Path):
+    stamp = _store_stamp(path)
+    with _ARTICLES_CACHE_LOCK:
+        cached = _ARTICLES_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached
+    data = _parse_store(path.read_bytes())
+    index: Dict[str, list[str]] = {}
+    dois: Dict[str, str] = {}
+    for key, article in data.items():
+        if isinstance(article, dict):
+            journal = (article.get("journal") or "").strip().lower()
+            if journal:
+                index.setdefault(journal, []).append(key)
+            doi = article.get("doi")
+            if doi and isinstance(doi, str):
+                dois.setdefault(doi, key)
+    cached = (stamp, data, index, dois)
+    with _ARTICLES_CACHE_LOCK:
+        _ARTICLES_CACHE[path] = cached
+    return cached
+
+
 def _save_articles(articles: Dict[str, dict], output_path: Path) -> None:
     """Write *articles* to *output_path*, merging with any existing data."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.parent != _PDF_DIR:
+        # The default store directory is created at import time.
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     existing: Dict[str, dict] = {}
     existing_count = 0
-    if output_path.is_file():
-        with output_path.open("r", encoding="utf-8") as fh:
-            try:
-                existing = json.load(fh)
-                existing_count = len(existing)
-            except Exception as exc:
-                _debug(
-                    f"Failed to load existing JSON from {output_path}: {exc}. "
-                    "Proceeding with an empty store."
-                )
-                existing = {}
-                existing_count = 0
+    try:
+        raw = output_path.read_bytes()
+    except FileNotFoundError:
+        raw = b""
+    if raw:
+        try:
+            existing = _parse_store(raw)
+            existing_count = len(existing)
+        except Exception as exc:
+            # Writing now would replace every stored article with *articles*.
+            _debug(
+                "Failed to load existing JSON from {path}: {exc}. "
+                "Leaving the store untouched.",
+                path=output_path,
+                exc=exc,
+            )
+            raise
 
     safe_articles = _json_safe_copy(articles)
     if isinstance(articles, dict):
@@ -235,63 +971,200 @@ def _save_articles(articles: Dict[str, dict], output_path: Path) -> None:
     if not isinstance(safe_articles, dict):
         _debug(
             "Incoming article payload for {path} is not a mapping; "
-            "coercing to an empty dictionary.".format(path=output_path)
+            "coercing to an empty dictionary.",
+            path=output_path,
         )
         safe_articles = {}
 
-    new_keys = [key for key in safe_articles if key not in existing]
-    updated_keys = [key for key in safe_articles if key in existing]
+    # ``existing`` came straight from JSON and ``safe_articles`` is already
+    # sanitised, so the merged mapping needs no further copying.
     existing.update(safe_articles)
-    safe_existing = _json_safe_copy(existing)
+    # Every incoming key either grew the store or replaced an entry.
+    new_count = len(existing) - existing_count
+    updated_count = len(safe_articles) - new_count
     _debug(
         "Merging articles into {path}. Incoming: {incoming} (new: {new}, updated: {updated}). "
-        "Existing entries before merge: {before}. Total after merge: {after}.".format(
+        "Existing entries before merge: {before}. Total after merge: {after}.",
+        path=output_path,
+        incoming=len(safe_articles),
+        new=new_count,
+        updated=updated_count,
+        before=existing_count,
+        after=len(existing),
+    )
+    try:
+        payload = _dump_store(existing)
+    except TypeError as exc:
+        _debug(
+            "Primary serialization for {path} failed due to {exc!s}; "
+            "retrying with best-effort string coercion.",
             path=output_path,
-            incoming=len(safe_articles),
-            new=len(new_keys),
-            updated=len(updated_keys),
-            before=existing_count,
-            after=len(safe_existing),
+            exc=exc,
+        )
+        payload = json.dumps(existing, indent=2, sort_keys=True, default=str).encode(
+            "utf-8"
         )
+    # Write beside the store and swap it in, so readers never see a partial
+    # file; each writer gets its own temporary name as saves can overlap.
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=output_path.name + ".", suffix=".tmp", dir=output_path.parent
     )
-    with output_path.open("w", encoding="utf-8") as fh:
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            os.fchmod(fh.fileno(), 0o644)
+            fh.write(payload)
+        os.replace(tmp_name, output_path)
+    except BaseException:
         try:
-            json.dump(safe_existing, fh, indent=2, sort_keys=True)
-        except TypeError as exc:
-            _debug(
-                "Primary serialization for {path} failed due to {exc!s}; "
-                "retrying with best-effort string coercion.".format(
-                    path=output_path, exc=exc
-                )
-            )
-            fh.seek(0)
-            fh.truncate()
-            json.dump(safe_existing, fh, indent=2, sort_keys=True, default=str)
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    with _ARTICLES_CACHE_LOCK:
+        _ARTICLES_CACHE.pop(Path(output_path), None)
     _debug(
-        f"Finished writing {len(safe_existing)} articles to {output_path}. "
-        f"File size is now {output_path.stat().st_size} bytes."
+        "Finished writing {count} articles to {path}. "
+        "File size is now {size} bytes.",
+        count=len(existing),
+        path=output_path,
+        size=len(payload),
     )
 
 
+def _journal_paths(json_path: Path) -> list[Path]:
+    """Return the journal files of every run against the store *json_path*."""
+
+    json_path = Path(json_path)
+    return sorted(json_path.parent.glob(f"{json_path.name}.*.journal"))
+
+
+def _write_journal(fh, key: str, article: dict) -> None:
+    """Write *article* to the open journal *fh* as one flushed JSON line."""
+
+    record = {key: _json_safe_copy(article)}
+    if _orjson is not None:
+        line = _orjson.dumps(record, default=str).decode("utf-8")
+    else:
+        line = json.dumps(record, default=str)
+    fh.write(line + "\n")
+    fh.flush()
+
+
+class _RunJournal:
+    """Append-only journal of the records one run adds to an article store.
+
+    The journal makes records durable as soon as they are fetched; the sorted
+    snapshot in ``articles.json`` is only rewritten at the end of the run or
+    by :func:`_compact_articles`.  Each run writes its own file and holds an
+    exclusive lock on it, so runs that overlap never fold in or delete each
+    other's journal."""
+
+    def __init__(self, json_path: Path):
+        json_path = Path(json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(
+            prefix=json_path.name + ".", suffix=".journal", dir=json_path.parent
+        )
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        self.path = Path(name)
+        self._fh = os.fdopen(fd, "a", encoding="utf-8")
+
+    def append(self, key: str, article: dict) -> None:
+        """Append *article* under *key* as a single JSON line."""
+
+        try:
+            _write_journal(self._fh, key, article)
+        except Exception as exc:
+            _debug(
+                "Failed to append {key} to {path}: {exc}",
+                key=key,
+                path=self.path,
+                exc=exc,
+            )
+
+    def close(self) -> None:
+        """Release the journal, leaving its records for the next compaction."""
+
+        self._fh.close()
+
+    def discard(self) -> None:
+        """Remove the journal once its records are saved in the store."""
+
+        if not self._fh.closed:
+            self.path.unlink(missing_ok=True)
+        self._fh.close()
+
+
+def _compact_articles(json_path: Path) -> int:
+    """Merge the journals of finished runs into *json_path* and remove them.
+
+    Journals still locked by a running :class:`_RunJournal` are left alone.
+    Returns the number of records recovered."""
+
+    pending: Dict[str, dict] = {}
+    claimed = []
+    try:
+        for journal_path in _journal_paths(json_path):
+            try:
+                fh = journal_path.open("r", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                fh.close()
+                continue
+            if os.fstat(fh.fileno()).st_nlink == 0:
+                # Its run saved and removed it while we waited.
+                fh.close()
+                continue
+            claimed.append((journal_path, fh))
+            for line in fh:
+                try:
+                    record = _parse_store(line)
+                except ValueError:
+                    # A torn final line from an interrupted write.
+                    continue
+                if isinstance(record, dict):
+                    pending.update(record)
+
+        if pending:
+            _debug(
+                "Recovering {count} journaled articles into {path}.",
+                count=len(pending),
+                path=json_path,
+            )
+            _save_articles(pending, Path(json_path))
+        for journal_path, _ in claimed:
+            journal_path.unlink(missing_ok=True)
+    finally:
+        for _, fh in claimed:
+            fh.close()
+    return len(pending)
+
+
 def _extract_feed_urls(opml_source: str | Path, with_titles: bool = False) -> List:
     """Return RSS ``xmlUrl`` values (and optionally titles) from an OPML document."""
     if isinstance(opml_source, Path) or Path(opml_source).is_file():
-        xml = Path(opml_source).read_text(encoding="utf-8")
+        source = str(opml_source)
     else:
-        xml = opml_source
-    tree = _ET.fromstring(xml)
-    feeds = [
-        (
-            node.attrib["xmlUrl"],
-            node.attrib.get("title") or node.attrib.get("text") or "",
-        )
-        for node in tree.iter("outline")
-        if node.attrib.get("type") == "rss"
-    ]
+        source = io.BytesIO(opml_source.encode("utf-8"))
+    # Stream the document and discard each outline once read, so large
+    # subscription lists never have to be held as a full tree.
+    feeds = []
+    for _, node in _ET.iterparse(source, events=("end",)):
+        if node.tag != "outline":
+            continue
+        attrib = node.attrib
+        if attrib.get("type") == "rss":
+            feeds.append(
+                (attrib["xmlUrl"], attrib.get("title") or attrib.get("text") or "")
+            )
+        node.clear()
     _debug(
-        "Extracted {count} feeds from {source}".format(
-            count=len(feeds), source=opml_source
-        )
+        "Extracted {count} feeds from {source}",
+        count=len(feeds),
+        source=opml_source,
     )
     if with_titles:
         return feeds
@@ -308,9 +1181,28 @@ def _entry_timestamp(entry) -> _dt.datetime | None:
     return _dt.datetime(*ts[:6], tzinfo=_dt.timezone.utc)
 
 
+def _entry_time_tuple(entry) -> tuple[int, ...] | None:
+    """Return the entry's UTC ``(Y, M, D, h, m, s)`` tuple for cheap comparisons."""
+    ts = getattr(entry, "published_parsed", None) or getattr(
+        entry, "updated_parsed", None
+    )
+    if ts is None:
+        return None
+    return tuple(ts[:6])
+
+
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+_RE_SUMMARY_AUTHORS = re.compile(r"<strong>Authors:</strong>(.*?)</p>", re.S)
+_RE_SUMMARY_JOURNAL = re.compile(r"<strong>Journal:</strong>(.*?)</p>", re.S)
+_RE_SUMMARY_ABSTRACT = re.compile(r"<h3>Abstract</h3>\s*<p>(.*?)</p>", re.S)
+_RE_DOI = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.I)
+_RE_DOI_ORG_TEXT = re.compile(r"https?://doi.org/\S+")
+
+
+@functools.lru_cache(maxsize=1024)
 def _strip_html(text: str) -> str:
     """Return *text* with HTML tags removed."""
-    return re.sub(r"<[^>]+>", "", text or "")
+    return _RE_HTML_TAG.sub("", text or "")
 
 
 def _parse_longevity_summary(summary: str) -> tuple[list[str], str, str]:
@@ -321,16 +1213,16 @@ def _parse_longevity_summary(summary: str) -> tuple[list[str], str, str]:
     if not summary:
         return authors, journal, abstract
 
-    m = re.search(r"<strong>Authors:</strong>(.*?)</p>", summary, re.S)
+    m = _RE_SUMMARY_AUTHORS.search(summary)
     if m:
         names = _strip_html(m.group(1)).split(",")
         authors = [n.strip() for n in names if n.strip()]
 
-    m = re.search(r"<strong>Journal:</strong>(.*?)</p>", summary, re.S)
+    m = _RE_SUMMARY_JOURNAL.search(summary)
     if m:
         journal = _strip_html(m.group(1)).strip()
 
-    m = re.search(r"<h3>Abstract</h3>\s*<p>(.*?)</p>", summary, re.S)
+    m = _RE_SUMMARY_ABSTRACT.search(summary)
     if m:
         abstract = _strip_html(m.group(1)).strip()
     else:
@@ -354,7 +1246,7 @@ def _extract_doi(entry) -> str:
         # Look for a DOI pattern in id or link fields
         for field in (_get("id"), _get("link")):
             if field:
-                m = re.search(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", str(field), re.I)
+                m = _RE_DOI.search(str(field))
                 if m:
                     doi = m.group(0)
                     break
@@ -363,8 +1255,21 @@ def _extract_doi(entry) -> str:
     return doi
 
 
-def _entry_to_article_data(entry) -> dict:
-    """Return a dictionary with standardized article metadata for storage."""
+def _article_key(identifier: str) -> str:
+    """Return the compact, stable store key for an entry *identifier*.
+
+    Entry ids are usually long URLs; a 128-bit BLAKE2b digest keeps
+    ``articles.json`` small while remaining collision-free in practice.  The
+    original identifier is kept in the record's ``id`` field."""
+
+    return hashlib.blake2b(identifier.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _entry_to_article_data(entry, now: str | None = None) -> dict:
+    """Return a dictionary with standardized article metadata for storage.
+
+    *now* is the ISO timestamp recorded as ``date-added``; batch callers pass
+    one per run instead of reading the clock for every entry."""
     ts = _entry_timestamp(entry)
     authors = []
     if hasattr(entry, "authors"):
@@ -391,7 +1296,7 @@ def _entry_to_article_data(entry) -> dict:
         "link": entry.get("link", ""),
         "year": ts.year if ts else None,
         "abstract": abstract,
-        "date-added": _dt.datetime.now(_dt.timezone.utc).isoformat(),
+        "date-added": now or _dt.datetime.now(_dt.timezone.utc).isoformat(),
         "num-retrievals": 0,
         "lt-relevance": 0,
         "mt-relevance": 0,
@@ -399,12 +1304,22 @@ def _entry_to_article_data(entry) -> dict:
     }
 
 
+_RE_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+_RE_DOI_URL_PREFIX = re.compile(r"^https?://(dx\.)?doi\.org/")
+_RE_DOI_PREFIX = re.compile(r"^doi:")
+_RE_UNSAFE_DOI_CHARS = re.compile(r"[^a-z0-9._-]")
+_RE_URL_SCHEME = re.compile(r"^[a-z]+://", re.I)
+_RE_PDF_SUFFIX = re.compile(r"\.pdf$", re.I)
+
+
+@functools.lru_cache(maxsize=4096)
 def _sanitize_filename(name: str) -> str:
     """Return *name* stripped to a safe filesystem format."""
-    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", name)
+    safe = _RE_UNSAFE_FILENAME.sub("_", name)
     return safe[:50]
 
 
+@functools.lru_cache(maxsize=4096)
 def _doi_filename(doi: str) -> str:
     """Return a safe filename derived from *doi*.
 
@@ -415,10 +1330,10 @@ def _doi_filename(doi: str) -> str:
     if not doi:
         return ""
     doi = doi.lower().strip()
-    doi = re.sub(r"^https?://(dx\.)?doi\.org/", "", doi)
-    doi = re.sub(r"^doi:", "", doi)
+    doi = _RE_DOI_URL_PREFIX.sub("", doi)
+    doi = _RE_DOI_PREFIX.sub("", doi)
     doi = doi.replace("/", "_")
-    return "doiorg" + re.sub(r"[^a-z0-9._-]", "", doi)
+    return "doiorg" + _RE_UNSAFE_DOI_CHARS.sub("", doi)
 
 
 def _url_filename(url: str) -> str:
@@ -443,15 +1358,15 @@ def _url_filename(url: str) -> str:
     if parsed.query:
         parts.append(parsed.query.replace("/", "_"))
 
-    candidate = "_".join(filter(None, parts)) or re.sub(r"^[a-z]+://", "", url, flags=re.I)
+    candidate = "_".join(filter(None, parts)) or _RE_URL_SCHEME.sub("", url)
     candidate = _sanitize_filename(candidate).strip("_")
-    candidate = re.sub(r"(?i)\.pdf$", "", candidate).strip("_")
+    candidate = _RE_PDF_SUFFIX.sub("", candidate).strip("_")
 
     if candidate:
         return candidate
 
     fallback = _sanitize_filename(url)
-    fallback = re.sub(r"(?i)\.pdf$", "", fallback).strip("_")
+    fallback = _RE_PDF_SUFFIX.sub("", fallback).strip("_")
     return fallback
 
 
@@ -480,62 +1395,219 @@ def _output_pdf_path(dest_dir: Path, entry, urls: Sequence[str]) -> Path:
         suffix += 1
 
 
+def _move_to_free_name(src: Path, dest_dir: Path) -> Path:
+    """Move *src* into *dest_dir* without replacing any existing file.
+
+    Tries ``<stem><ext>`` and then ``<stem>_1<ext>``, ``<stem>_2<ext>``, ...
+    like :func:`_output_pdf_path`, claiming each candidate atomically so a
+    concurrent download cannot take the same name in between."""
+
+    suffix = 0
+    while True:
+        stem = src.stem if suffix == 0 else f"{src.stem}_{suffix}"
+        target = dest_dir / f"{stem}{src.suffix}"
+        suffix += 1
+        try:
+            os.link(src, target)
+        except FileExistsError:
+            continue
+        except OSError:
+            # No hard link possible (other filesystem): reserve the name with
+            # an exclusive create, then move the file over the placeholder.
+            try:
+                os.close(os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+            except FileExistsError:
+                continue
+            try:
+                os.replace(src, target)
+            except OSError:
+                shutil.move(str(src), target)
+            return target
+        src.unlink()
+        return target
+
+
+_RE_SHELL_BLOCK = re.compile(r"```(?:bash)?\n(.*?)```", re.S)
+
+
 def _extract_shell_script(text: str) -> str:
     """Return the bash script contained in *text*."""
-    m = re.search(r"```(?:bash)?\n(.*?)```", text, re.S)
+    m = _RE_SHELL_BLOCK.search(text)
     if m:
         text = m.group(1)
     return text.strip()
 
 
-def _html_links_only(html: str) -> str:
-    """Return *html* reduced to a list of cleaned ``<a>`` tags."""
+class _LinkExtractor(HTMLParser):
+    """Collect ``<a href="...">text</a>`` lines from a page in a single pass.
 
-    timestamp = int(time.time() * 1000)
-    before_path = Path(f"/tmp/html_before_{timestamp}.html")
-    try:
-        before_path.write_text(html, encoding="utf-8")
-    except Exception as exc:
-        print(f"Could not write {before_path}: {exc}")
+    Text outside anchors and all tags other than ``<a>`` are dropped."""
 
-    # Keep only anchor tags
-    html = re.sub(
-        r"(?is)(<a\b[^>]*>.*?</a>)|<[^>]+|[^<]+",
-        lambda m: m.group(1) or "",
-        html,
-    )
+    def __init__(self) -> None:
+        super().__init__()
+        self.buf: list[str] = []
+        self._depth = 0
 
-    # Normalize href attribute
-    html = re.sub(
-        r"(?is)<a\b[^>]*?\bhref\s*=\s*(['\"]?)([^\s'\">]+)\1[^>]*>",
-        r'<a href="\2">',
-        html,
-    )
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = next((value for name, value in attrs if name == "href"), None)
+        if self._depth:
+            # Browsers close an open anchor when a new one starts.
+            self.buf.append("</a>\n")
+        self._depth = 1
+        self.buf.append(f'<a href="{href}">' if href else "<a>")
 
-    # Strip tags other than <a>
-    html = re.sub(r"(?is)<(?!/?a\b)[^>]+>", "", html)
+    def handle_endtag(self, tag):
+        if tag == "a" and self._depth:
+            self._depth = 0
+            self.buf.append("</a>\n")
 
-    # Drop non-http links
-    #html = re.sub(
-    #    r"(?is)<a\b[^>]*\bhref\s*=\s*(['\"]?)(?!https?:\/\/)[^'\">\s]+\1[^>]*>.*?</a>\s*",
-    #    "",
-    #    html,
-    #)
+    def handle_data(self, data):
+        if self._depth:
+            self.buf.append(data)
 
-    # Put each link on its own line
-    html = re.sub(r"</a>", "</a>\n", html)
+    def close(self):
+        super().close()
+        if self._depth:
+            self._depth = 0
+            self.buf.append("</a>\n")
 
-    after_path = Path(f"/tmp/html_after_{timestamp}.html")
-    try:
-        after_path.write_text(html, encoding="utf-8")
-    except Exception as exc:
-        print(f"Could not write {after_path}: {exc}")
+
+def _html_links_only(html: str) -> str:
+    """Return *html* reduced to a list of cleaned ``<a>`` tags."""
+
+    if _DEBUG_HTML:
+        timestamp = int(time.time() * 1000)
+        before_path = Path(f"/tmp/html_before_{timestamp}.html")
+        try:
+            before_path.write_text(html, encoding="utf-8")
+        except Exception as exc:
+            print(f"Could not write {before_path}: {exc}")
+
+    extractor = _LinkExtractor()
+    extractor.feed(html)
+    extractor.close()
+    html = "".join(extractor.buf)
+
+    if _DEBUG_HTML:
+        after_path = Path(f"/tmp/html_after_{timestamp}.html")
+        try:
+            after_path.write_text(html, encoding="utf-8")
+        except Exception as exc:
+            print(f"Could not write {after_path}: {exc}")
 
     return html.strip()
 
 
 _DOI_HOSTS = {"doi.org", "www.doi.org", "dx.doi.org"}
 
+_PDF_URL_TEMPLATES_JSON = _PDF_DIR / "pdf_url_templates.json"
+_PDF_URL_TEMPLATES: Dict[str, str] | None = None
+_PDF_URL_TEMPLATES_LOCK = threading.Lock()
+
+
+def _pdf_url_template(landing_url: str, pdf_url: str) -> str:
+    """Return *pdf_url* rewritten as a template relative to *landing_url*.
+
+    The landing page's path and query are replaced with ``{PATH}`` and
+    ``{QUERY}`` placeholders so the same recipe can be applied to other
+    articles from the same host.  An empty string is returned when *pdf_url*
+    does not embed the landing page location."""
+
+    landing = urllib.parse.urlparse(landing_url)
+    pdf = urllib.parse.urlparse(pdf_url)
+    path = landing.path.rstrip("/")
+    if not path or not landing.netloc or landing.netloc.lower() != pdf.netloc.lower():
+        return ""
+
+    origin = f"{pdf.scheme}://{pdf.netloc}"
+    if not pdf_url.startswith(origin):
+        return ""
+    rest = pdf_url[len(origin):]
+    if landing.query and landing.query in rest:
+        rest = rest.replace(landing.query, "{QUERY}")
+    if path in rest:
+        rest = rest.replace(path, "{PATH}", 1)
+    if "{PATH}" not in rest and "{QUERY}" not in rest:
+        return ""
+    return origin + rest
+
+
+def _fill_pdf_url_template(template: str, landing_url: str) -> str:
+    """Return the PDF URL produced by applying *template* to *landing_url*."""
+
+    landing = urllib.parse.urlparse(landing_url)
+    path = landing.path.rstrip("/")
+    if "{PATH}" in template and not path:
+        return ""
+    if "{QUERY}" in template and not landing.query:
+        return ""
+    return template.replace("{PATH}", path).replace("{QUERY}", landing.query)
+
+
+def _pdf_url_templates() -> Dict[str, str]:
+    """Return the cached host → PDF URL template mapping, loading it once."""
+
+    global _PDF_URL_TEMPLATES
+
+    with _PDF_URL_TEMPLATES_LOCK:
+        if _PDF_URL_TEMPLATES is None:
+            try:
+                data = json.loads(_PDF_URL_TEMPLATES_JSON.read_text(encoding="utf-8"))
+            except Exception:
+                data = {}
+            _PDF_URL_TEMPLATES = data if isinstance(data, dict) else {}
+        return _PDF_URL_TEMPLATES
+
+
+def _store_pdf_url_template(host: str, template: str | None) -> None:
+    """Record (or with ``None`` forget) the PDF URL *template* for *host*."""
+
+    templates = _pdf_url_templates()
+    with _PDF_URL_TEMPLATES_LOCK:
+        if template is None:
+            if templates.pop(host, None) is None:
+                return
+        elif templates.get(host) == template:
+            return
+        else:
+            templates[host] = template
+        try:
+            _PDF_URL_TEMPLATES_JSON.write_text(
+                json.dumps(templates, indent=2, sort_keys=True), encoding="utf-8"
+            )
+        except Exception as exc:
+            print(f"Could not write {_PDF_URL_TEMPLATES_JSON}: {exc}")
+
+
+# Meta tags naming a page's own URL, in order of preference.  They are combined
+# into one alternation so the page is scanned once rather than once per tag.
+_EFFECTIVE_URL_TAGS = (
+    ("base", r"<base[^>]+href\s*=\s*['\"](?P<base>[^'\"]+)['\"]"),
+    ("canonical", r"<link[^>]+rel\s*=\s*['\"]canonical['\"][^>]*href\s*=\s*['\"](?P<canonical>[^'\"]+)['\"]"),
+    ("og_prop", r"<meta[^>]+property\s*=\s*['\"]og:url['\"][^>]*content\s*=\s*['\"](?P<og_prop>[^'\"]+)['\"]"),
+    ("og_name", r"<meta[^>]+name\s*=\s*['\"]og:url['\"][^>]*content\s*=\s*['\"](?P<og_name>[^'\"]+)['\"]"),
+    ("public_prop", r"<meta[^>]+property\s*=\s*['\"]citation_public_url['\"][^>]*content\s*=\s*['\"](?P<public_prop>[^'\"]+)['\"]"),
+    ("public_name", r"<meta[^>]+name\s*=\s*['\"]citation_public_url['\"][^>]*content\s*=\s*['\"](?P<public_name>[^'\"]+)['\"]"),
+    ("fulltext_prop", r"<meta[^>]+property\s*=\s*['\"]citation_fulltext_html_url['\"][^>]*content\s*=\s*['\"](?P<fulltext_prop>[^'\"]+)['\"]"),
+    ("fulltext_name", r"<meta[^>]+name\s*=\s*['\"]citation_fulltext_html_url['\"][^>]*content\s*=\s*['\"](?P<fulltext_name>[^'\"]+)['\"]"),
+    ("refresh", r"<meta[^>]+http-equiv\s*=\s*['\"]refresh['\"][^>]*content\s*=\s*['\"][^'\"]*url=(?P<refresh>[^'\" >;]+)"),
+)
+_RE_EFFECTIVE_URL = re.compile(
+    "|".join(pattern for _, pattern in _EFFECTIVE_URL_TAGS), re.I
+)
+_RE_ANCHOR_HREF = re.compile(r"<a[^>]+href=\s*['\"](https?://[^'\"]+)['\"]", re.I)
+_RE_HTTP_URL = re.compile(r"https?://\S+")
+_RE_ABSOLUTE_URL = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*://")
+# Publishers' Highwire tag for the article PDF, accepted as ``name`` or
+# ``property``.
+_RE_CITATION_PDF_URL = re.compile(
+    r"<meta[^>]+(?:name|property)\s*=\s*['\"]citation_pdf_url['\"][^>]*"
+    r"content\s*=\s*['\"]([^'\"]+)['\"]",
+    re.I,
+)
+
 
 def _determine_effective_url(
     requested_url: str,
@@ -556,23 +1628,15 @@ def _determine_effective_url(
     if not html:
         return fallback
 
-    patterns = [
-        r"<base[^>]+href\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<link[^>]+rel\s*=\s*['\"]canonical['\"][^>]*href\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+property\s*=\s*['\"]og:url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+name\s*=\s*['\"]og:url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+property\s*=\s*['\"]citation_public_url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+name\s*=\s*['\"]citation_public_url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+property\s*=\s*['\"]citation_fulltext_html_url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+name\s*=\s*['\"]citation_fulltext_html_url['\"][^>]*content\s*=\s*['\"]([^'\"]+)['\"]",
-        r"<meta[^>]+http-equiv\s*=\s*['\"]refresh['\"][^>]*content\s*=\s*['\"][^'\"]*url=([^'\" >;]+)",
-    ]
+    # Keep the first occurrence of each tag, then try them by preference.
+    found: dict[str, str] = {}
+    for match in _RE_EFFECTIVE_URL.finditer(html):
+        found.setdefault(match.lastgroup, match.group(match.lastgroup))
+        if len(found) == len(_EFFECTIVE_URL_TAGS):
+            break
 
-    for pattern in patterns:
-        match = re.search(pattern, html, flags=re.I)
-        if not match:
-            continue
-        candidate = match.group(1).strip()
+    for name, _ in _EFFECTIVE_URL_TAGS:
+        candidate = found.get(name, "").strip()
         if not candidate:
             continue
         resolved = urllib.parse.urljoin(base_source, candidate)
@@ -587,7 +1651,7 @@ def _determine_effective_url(
         return fallback
 
     host_counts: Counter[str] = Counter()
-    for link in re.findall(r"<a[^>]+href=\s*['\"](https?://[^'\"]+)['\"]", html, flags=re.I):
+    for link in _RE_ANCHOR_HREF.findall(html):
         parsed_link = urllib.parse.urlparse(link)
         host = parsed_link.netloc.lower()
         if host:
@@ -613,26 +1677,37 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
         print("No link available for entry")
         return ""
 
-    client = openai.OpenAI()
+    client = _openai_client()
     #script_path = (_BASE_DIR / "pdf_fetch_generic.sh").resolve()
     script_path = (_BASE_DIR / "pdf_fetch_generic_curl.sh").resolve()
-    if not script_path.is_file():
+    # The curl script only helps when its browser-impersonating curl build is
+    # installed beside it; otherwise fetch in-process and skip the fork.
+    use_script = (
+        os.environ.get("PDF_FETCH_BASH") == "1"
+        or (_BASE_DIR / "curl-impersonate-ff").is_file()
+    )
+    if use_script and not script_path.is_file():
         print(f"Fetch script not found at {script_path}")
         return ""
 
     def _fetch(u: str) -> tuple[bytes, str, str]:
+        # The URL is handed to curl as a plain argv entry (no shell is
+        # involved), so only web URLs are allowed through.
+        if urllib.parse.urlparse(u).scheme not in {"http", "https"}:
+            raise RuntimeError(f"Refusing to fetch non-HTTP URL {u!r}")
+        if not use_script:
+            return _browse_fetch(u)
+
         temp_file = dest_dir / "tempfile"
         temp_file.unlink(missing_ok=True)
 
-        env = os.environ.copy()
-
         try:
             result = subprocess.run(
                 ["bash", str(script_path), u],
                 cwd=str(dest_dir),
                 capture_output=True,
                 text=True,
-                env=env,
+                timeout=_FETCH_SCRIPT_TIMEOUT,
             )
         except Exception as exc:
             raise RuntimeError(f"Failed to launch fetch script: {exc}") from exc
@@ -643,14 +1718,14 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
                 f"Fetch script exited with {result.returncode} for {u}: {output}"
             )
 
-        if not temp_file.exists():
-            raise RuntimeError("Fetch script did not produce an output file")
-
-        data = temp_file.read_bytes()
+        try:
+            data = temp_file.read_bytes()
+        except FileNotFoundError:
+            raise RuntimeError("Fetch script did not produce an output file") from None
         temp_file.unlink(missing_ok=True)
 
         transcript = "\n".join(filter(None, [result.stdout, result.stderr]))
-        urls = re.findall(r"https?://\S+", transcript)
+        urls = _RE_HTTP_URL.findall(transcript)
         final_url = urls[-1].rstrip('\"\'') if urls else u
 
         if data.startswith(b"%PDF"):
@@ -665,7 +1740,21 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
             return entry.get(name, "") or ""
         return getattr(entry, name, "") or ""
 
+    def _is_pdf(data: bytes, ctype: str) -> bool:
+        return ctype.startswith("application/pdf") or data.startswith(b"%PDF")
+
+    def _save_pdf(data: bytes, urls: list[str]) -> None:
+        pdf_path = _output_pdf_path(
+            dest_dir, entry, [*urls, _entry_field("link"), _entry_field("id")]
+        )
+        try:
+            pdf_path.write_bytes(data)
+            print(f"Saved PDF {pdf_path}")
+        except Exception as exc:
+            print(f"Failed to save PDF: {exc}")
+
     visited: list[str] = []
+    landing_url = ""
     for i in range(5):
         if url in visited:
             print("Encountered a repeated URL; aborting")
@@ -682,23 +1771,13 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
             if candidate and candidate not in visited:
                 visited.append(candidate)
 
-        if ctype.startswith("application/pdf") or data.startswith(b"%PDF"):
-            pdf_path = _output_pdf_path(
-                dest_dir,
-                entry,
-                [
-                    final_url,
-                    fallback_url,
-                    url,
-                    _entry_field("link"),
-                    _entry_field("id"),
-                ],
-            )
-            try:
-                pdf_path.write_bytes(data)
-                print(f"Saved PDF {pdf_path}")
-            except Exception as exc:
-                print(f"Failed to save PDF: {exc}")
+        if _is_pdf(data, ctype):
+            _save_pdf(data, [final_url, fallback_url, url])
+            if landing_url:
+                template = _pdf_url_template(landing_url, url)
+                if template:
+                    host = urllib.parse.urlparse(landing_url).netloc.lower()
+                    _store_pdf_url_template(host, template)
             return f"Downloaded {fallback_url}"
 
         html = data.decode("utf-8", errors="ignore")
@@ -708,6 +1787,37 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
         if base_url and base_url not in visited:
             visited.append(base_url)
 
+        host = urllib.parse.urlparse(base_url or "").netloc.lower()
+        if not landing_url and host and host not in _DOI_HOSTS:
+            landing_url = base_url
+            template = _pdf_url_templates().get(host)
+            candidate = _fill_pdf_url_template(template, landing_url) if template else ""
+            if candidate and candidate not in visited:
+                # Reuse the recipe learnt from an earlier article on this host
+                # instead of asking the LLM again.  This does not use up an
+                # attempt; if it fails, the landing page is used as usual.
+                print(f"Trying cached PDF URL pattern for {host}: {candidate}")
+                visited.append(candidate)
+                try:
+                    t_data, t_ctype, t_final = _fetch(candidate)
+                except Exception as exc:
+                    print(f"Failed to fetch {candidate}: {exc}")
+                else:
+                    if _is_pdf(t_data, t_ctype):
+                        _save_pdf(t_data, [t_final, candidate])
+                        return f"Downloaded {t_final or candidate}"
+                # The cached recipe did not yield a PDF for this article.
+                _store_pdf_url_template(host, None)
+
+        m = _RE_CITATION_PDF_URL.search(html)
+        if m:
+            candidate = urllib.parse.urljoin(base_url or fallback_url, m.group(1))
+            if candidate not in visited:
+                # The page names its own PDF; follow it without asking the LLM.
+                print(f"Following citation_pdf_url: {candidate}")
+                url = candidate
+                continue
+
         snippet = _html_links_only(html)
         print(f"Cleaned HTML: {snippet}")
 
@@ -768,7 +1878,7 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
             print(f"LLM request failed: {exc}")
             break
 
-        m = re.search(r'https?://\S+', guess)
+        m = _RE_HTTP_URL.search(guess)
         if m:
             url_candidate = m.group(0)
         else:
@@ -788,7 +1898,7 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
             and parsed_base
             and parsed_base.path
             and not parsed_base.path.endswith("/")
-            and not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*://", url_candidate)
+            and not _RE_ABSOLUTE_URL.match(url_candidate)
             and not url_candidate.startswith(("/", "#"))
         ):
             base_for_join = urllib.parse.urlunparse(
@@ -799,14 +1909,21 @@ def _llm_shell_commands(entry, dest_dir: Path) -> str:
     return ""
 
 
+_UNSAFE_COMMAND_CHARS = frozenset(";&|`$\n\r")
+_ALLOWED_COMMANDS = frozenset({"wget", "curl"})
+
+
 def _is_safe_command(cmd: str) -> bool:
     """Check if *cmd* looks safe to execute."""
-    if re.search(r"[;&|`$]", cmd):
+    if not _UNSAFE_COMMAND_CHARS.isdisjoint(cmd):
+        return False
+    try:
+        tokens = shlex.split(cmd)
+    except ValueError:
         return False
-    tokens = shlex.split(cmd)
     if not tokens:
         return False
-    return tokens[0] in {"wget", "curl"}
+    return tokens[0] in _ALLOWED_COMMANDS
 
 
 def _pdf_file_valid(path: Path) -> bool:
@@ -814,29 +1931,77 @@ def _pdf_file_valid(path: Path) -> bool:
     if path.stat().st_size < 10_000:
         print(f"PDF too small: {path}")
         return False
+    # Cheap structural sniff first: most rejects are HTML error pages, which
+    # never need a full PyPDF2 parse.
+    try:
+        with path.open("rb") as fh:
+            head = fh.read(5)
+            fh.seek(-1024, os.SEEK_END)
+            tail = fh.read()
+    except OSError as exc:
+        print(f"PDF unreadable: {path} ({exc})")
+        return False
+    if head != b"%PDF-" or b"%%EOF" not in tail:
+        print(f"PDF corrupt: {path} (missing PDF header or trailer)")
+        return False
     try:
-        from PyPDF2 import PdfReader
+        pymupdf = _import_pymupdf()
+        if pymupdf is not None:
+            with pymupdf.open(str(path)) as doc:
+                if doc.page_count < 1:
+                    raise ValueError("no pages")
+        else:
+            from PyPDF2 import PdfReader
 
-        PdfReader(str(path))
+            PdfReader(str(path))
     except Exception as exc:
         print(f"PDF corrupt: {path} ({exc})")
         return False
     return True
 
 
+def _import_pymupdf():
+    """Return the optional PyMuPDF module, or ``None`` when not installed."""
+
+    try:
+        import pymupdf
+    except ImportError:
+        try:  # releases before 1.24 only provide the legacy name
+            import fitz as pymupdf
+        except ImportError:
+            return None
+    return pymupdf
+
+
+def _pdf_text(path: Path, max_pages: int | None = None) -> str:
+    """Return the text layer of the first *max_pages* pages of *path*.
+
+    PyMuPDF is used when available since it extracts text far faster than
+    PyPDF2; pages that fail to extract are skipped."""
+
+    pymupdf = _import_pymupdf()
+    if pymupdf is not None:
+        with pymupdf.open(str(path)) as doc:
+            count = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+            return "".join(doc.load_page(i).get_text() for i in range(count))
+
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(str(path))
+    text = ""
+    for page in reader.pages[:max_pages]:
+        try:
+            text += page.extract_text() or ""
+        except Exception:
+            continue
+    return text
+
+
 def _extract_doi_from_pdf(path: Path) -> str:
     """Return a DOI URL if one can be parsed from *path*."""
     try:
-        from PyPDF2 import PdfReader
-
-        reader = PdfReader(str(path))
-        text = ""
-        for page in reader.pages[:2]:
-            try:
-                text += page.extract_text() or ""
-            except Exception:
-                continue
-        m = re.search(r"https?://doi.org/\S+", text)
+        text = _pdf_text(path, max_pages=2)
+        m = _RE_DOI_ORG_TEXT.search(text)
         if m:
             return m.group(0)
     except Exception as exc:
@@ -844,40 +2009,45 @@ def _extract_doi_from_pdf(path: Path) -> str:
     return ""
 
 
+_RE_CITATION_REFERENCE = re.compile(
+    r"<meta\s+[^>]*name=['\"]citation_reference['\"][^>]*>", re.I | re.S
+)
+_RE_DOI_ORG_URL = re.compile(r"https://doi.org/10\.[^'\"\s<>]+")
+_RE_CITATION_DOI = re.compile(r"citation_doi[^>]+content=[\'\"](10\.[^\'\"]+)[\'\"]", re.I)
+_RE_DOI_LABEL = re.compile(r"doi:?\s*(10\.[^\'\"\s<>]+)", re.I)
+_RE_CITATION_JOURNAL = re.compile(
+    r"citation_journal_title[^>]+content=['\"]([^'\"]+)['\"]", re.I
+)
+_RE_OG_SITE_NAME = re.compile(
+    r"property=['\"]og:site_name['\"] content=['\"]([^'\"]+)['\"]", re.I
+)
+
+
 def _extract_doi_from_url(url: str) -> str:
     """Return a DOI URL discovered on *url* or via redirects."""
     if not url:
         return ""
     try:
-        with urllib.request.urlopen(url) as resp:
-            final = resp.geturl()
-            data = resp.read().decode("utf-8", errors="ignore")
-            # Remove citation reference meta tags which may contain unrelated DOIs
-            data = re.sub(
-                r"<meta\s+[^>]*name=['\"]citation_reference['\"][^>]*>",
-                "",
-                data,
-                flags=re.I | re.S,
-            )
-            print(f"Incoming opened URL")
-            #print(f"Data: {data}")
+        final, data = _fetch_url_cached(url)
+        # Remove citation reference meta tags which may contain unrelated DOIs
+        data = _RE_CITATION_REFERENCE.sub("", data)
+        print(f"Incoming opened URL")
+        #print(f"Data: {data}")
     except Exception as exc:
         print(f"Failed to fetch {url}: {exc}")
         return ""
     if final.startswith("https://doi.org/"):
         return final
 
-    m = re.search(r"https://doi.org/10\.[^'\"\s<>]+", data)
+    m = _RE_DOI_ORG_URL.search(data)
     if m:
         return m.group(0)
 
-    m = re.search(
-        r"citation_doi[^>]+content=[\'\"](10\.[^\'\"]+)[\'\"]", data, re.I
-    )
+    m = _RE_CITATION_DOI.search(data)
     if m:
         return f"https://doi.org/{m.group(1)}"
 
-    m = re.search(r"doi:?\s*(10\.[^\'\"\s<>]+)", data, re.I)
+    m = _RE_DOI_LABEL.search(data)
     if m:
         return f"https://doi.org/{m.group(1)}"
 
@@ -889,17 +2059,16 @@ def _extract_journal_from_url(url: str) -> str:
     if not url:
         return ""
     try:
-        with urllib.request.urlopen(url) as resp:
-            data = resp.read().decode("utf-8", errors="ignore")
+        _, data = _fetch_url_cached(url)
     except Exception as exc:
         print(f"Failed to fetch {url}: {exc}")
         return ""
 
-    m = re.search(r"citation_journal_title[^>]+content=['\"]([^'\"]+)['\"]", data, re.I)
+    m = _RE_CITATION_JOURNAL.search(data)
     if m:
         return m.group(1)
 
-    m = re.search(r"property=['\"]og:site_name['\"] content=['\"]([^'\"]+)['\"]", data, re.I)
+    m = _RE_OG_SITE_NAME.search(data)
     if m:
         return m.group(1)
 
@@ -909,7 +2078,7 @@ def _extract_journal_from_url(url: str) -> str:
 def _llm_extract_doi(html: str) -> str:
     """Use an LLM to guess the DOI URL in *html*."""
     snippet = html[:8000]
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [
         {
             "role": "system",
@@ -922,23 +2091,27 @@ def _llm_extract_doi(html: str) -> str:
     ]
 
     try:
-        resp = client.chat.completions.create(
+        text = _chat_reply_cached(
+            client,
             model=THINKING_MODEL,
             messages=messages,
             max_completion_tokens=30,
         )
-        text = resp.choices[0].message.content
     except Exception as exc:
         print(f"LLM DOI extraction failed: {exc}")
         return ""
 
-    m = re.search(r"https?://doi.org/[^\s]+", text)
+    m = _RE_DOI_ORG_TEXT.search(text)
     return m.group(0).strip() if m else ""
 
 
+_RE_DOI_HREF = re.compile(r"href=['\"](https?://doi.org/[^'\"]+)['\"]", re.I)
+_RE_EXTERNAL_HREF = re.compile(r"href=\"(https?://(?!www\.fightaging\.org)[^\"]+)\"")
+
+
 def _llm_primary_link(html: str) -> str:
     """Return the doi.org link that is the primary focus of this Fight Aging! HTML."""
-    links = re.findall(r"href=['\"](https?://doi.org/[^'\"]+)['\"]", html, re.I)
+    links = _RE_DOI_HREF.findall(html)
     if not links:
         return ""
     if len(links) == 1:
@@ -946,7 +2119,7 @@ def _llm_primary_link(html: str) -> str:
 
     snippet = html[:4000]
     sample = "\n".join(f"- {l}" for l in links[:20])
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [
         {
             "role": "system",
@@ -961,25 +2134,24 @@ def _llm_primary_link(html: str) -> str:
     ]
 
     try:
-        resp = client.chat.completions.create(
+        text = _chat_reply_cached(
+            client,
             model=THINKING_MODEL,
             messages=messages,
             max_completion_tokens=30,
         )
-        text = resp.choices[0].message.content
     except Exception as exc:
         print(f"LLM link selection failed: {exc}")
         return ""
 
-    m = re.search(r"https?://doi.org/[^\s]+", text)
+    m = _RE_DOI_ORG_TEXT.search(text)
     return m.group(0).strip() if m else links[0]
 
 
 def _resolve_fightaging_item(url: str) -> tuple[str, str, str]:
     """Return the actual article link, DOI, and journal from a Fight Aging! post."""
     try:
-        with urllib.request.urlopen(url) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
+        _, html = _fetch_url_cached(url)
     except Exception as exc:
         print(f"Failed to fetch {url}: {exc}")
         return url, "", ""
@@ -990,7 +2162,7 @@ def _resolve_fightaging_item(url: str) -> tuple[str, str, str]:
     if doi:
         target = doi
     else:
-        m = re.search(r"href=\"(https?://(?!www\.fightaging\.org)[^\"]+)\"", html)
+        m = _RE_EXTERNAL_HREF.search(html)
         target = m.group(1) if m else url
         doi = _extract_doi_from_url(target)
 
@@ -1006,10 +2178,37 @@ def _discover_doi(entry, pdf_path: Path | None = None) -> str:
     return doi
 
 
-def _download_pdf(entry, dest_dir: Path) -> Path | None:
-    """Try to download a PDF for *entry* into *dest_dir*."""
-    dest_dir.mkdir(exist_ok=True)
-    before = set(dest_dir.glob("*.pdf"))
+# Publisher fetch scripts that hang (stalled downloads, challenge pages)
+# are killed after this many seconds so they cannot pin a download worker.
+_FETCH_SCRIPT_TIMEOUT = 300
+
+# Journals with a dedicated fetch script, keyed by lower-cased journal name:
+# (display name, script, whether the script takes only the DOI suffix).
+_JOURNAL_SCRIPTS = {
+    "nature communications": (
+        "Nature Communications",
+        _BASE_DIR / "pdf_fetch_natcomms.sh",
+        False,
+    ),
+    "nature aging": ("Nature Aging", _BASE_DIR / "pdf_fetch_nataging.sh", False),
+    "aging": ("Aging", _BASE_DIR / "pdf_fetch_aging.sh", False),
+    "translational cancer research": (
+        "Translational Cancer Research",
+        _BASE_DIR / "pdf_fetch_tcr.sh",
+        False,
+    ),
+    "aging cell": ("Aging Cell", _BASE_DIR / "pdf_fetch_agingcell.sh", True),
+    "geroscience": ("GeroScience", _BASE_DIR / "pdf_fetch_geroscience.sh", False),
+}
+
+
+def _run_pdf_fetchers(entry, work_dir: Path, doi: str | None = None) -> str:
+    """Run the journal-specific fetch script (or LLM browser) for *entry*.
+
+    Any PDFs produced are left in *work_dir* for :func:`_download_pdf` to
+    validate.  *doi* is the DOI already extracted from *entry*'s metadata,
+    if the caller has looked; the DOI used (possibly found on the article
+    page) is returned."""
 
     def _getattr(obj, name):
         return obj.get(name, "") if isinstance(obj, dict) else getattr(obj, name, "")
@@ -1022,155 +2221,94 @@ def _download_pdf(entry, dest_dir: Path) -> Path | None:
 
     print(f"Journal appears to be: {journal}")
     used_custom = False
-    lower_journal = journal.lower()
-    if lower_journal == "nature communications":
-
-        print(f"Nature Communications routine.")
-        doi = _extract_doi(entry)
-        if not doi:
-            print(f"Confirming link: {getattr(entry, 'link', '')}")
-            doi = _extract_doi_from_url(getattr(entry, 'link', ''))
-        print(f"Doi appears to be: {doi}")
-        if doi:
-            script = _BASE_DIR / "pdf_fetch_natcomms.sh"
-            cmd = [str(script), doi]
-            print(f"Running Nature Communications script: {' '.join(cmd)}")
-            try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
-                used_custom = True
-            except Exception as exc:
-                print(f"Nature Communications script failed: {exc}")
-
-    if lower_journal == "nature aging":
-
-        print(f"Nature Aging routine.")
-        doi = _extract_doi(entry)
-        if not doi:
-            print(f"Confirming link: {getattr(entry, "link", "")}")
-            doi = _extract_doi_from_url(getattr(entry, "link", ""))
-        print(f"Doi appears to be: {doi}")
-        if doi:
-            script = _BASE_DIR / "pdf_fetch_nataging.sh"
-            cmd = [str(script), doi]
-            print(f"Running Nature Aging script: {' '.join(cmd)}")
-            try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
-                used_custom = True
-            except Exception as exc:
-                print(f"Nature Aging script failed: {exc}")
-
-    if lower_journal == "aging":
-
-        print(f"Aging routine.")
-        doi = _extract_doi(entry)
+    custom = _JOURNAL_SCRIPTS.get(journal.lower())
+    if custom is not None:
+        name, script, suffix_only = custom
+        print(f"{name} routine.")
+        if doi is None:
+            doi = _extract_doi(entry)
         if not doi:
-            doi = _extract_doi_from_url(getattr(entry, "link", ""))
+            print(f"Confirming link: {_getattr(entry, 'link')}")
+            doi = _extract_doi_from_url(_getattr(entry, "link"))
         print(f"Doi appears to be: {doi}")
         if doi:
-            script = _BASE_DIR / "pdf_fetch_aging.sh"
-            cmd = [str(script), doi]
-            print(f"Running Aging script: {' '.join(cmd)}")
+            cmd = [str(script), doi.split("/")[-1] if suffix_only else doi]
+            print(f"Running {name} script: {' '.join(cmd)}")
             try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
+                subprocess.run(
+                    cmd, cwd=work_dir, check=True, timeout=_FETCH_SCRIPT_TIMEOUT
+                )
                 used_custom = True
             except Exception as exc:
-                print(f"Aging script failed: {exc}")
+                print(f"{name} script failed: {exc}")
 
-    if lower_journal == 'translational cancer research':
-        
-        print(f"Translational Cancer Research routine.")
-        doi = _extract_doi(entry)
-        if not doi:
-            doi = _extract_doi_from_url(getattr(entry, "link", ""))
-        print(f"Doi appears to be: {doi}")
-        if doi:
-            script = _BASE_DIR / "pdf_fetch_tcr.sh"
-            cmd = [str(script), doi]
-            print(f"Running Translational Cancer Research script: {' '.join(cmd)}")
-            try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
-                used_custom = True
-            except Exception as exc:
-                print(f"Translational Cancer Research script failed: {exc}")        
+    if not used_custom:
+        _llm_shell_commands(entry, work_dir)
+    return doi or ""
 
-    if lower_journal == "aging cell":
 
-        print(f"Aging Cell routine.")
-        doi = _extract_doi(entry)
-        if not doi:
-            doi = _extract_doi_from_url(getattr(entry, "link", ""))
-        print(f"Doi appears to be: {doi}")
-        if doi:
-            #suffix = doi.split("/")[-1].replace(".", "_")
-            suffix = doi.split("/")[-1]
-            script = _BASE_DIR / "pdf_fetch_agingcell.sh"
-            cmd = [str(script), suffix]
-            print(f"Running Aging Cell script: {' '.join(cmd)}")
-            try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
-                used_custom = True
-            except Exception as exc:
-                print(f"Aging Cell script failed: {exc}")
+@functools.lru_cache(maxsize=16)
+def _scratch_parent(dest_dir: Path, final_dir: Path) -> Path:
+    """Return where to stage downloads so they can be renamed into *final_dir*.
 
-    if lower_journal == "geroscience":
+    *dest_dir* is used when it shares a filesystem with *final_dir*;
+    otherwise staging moves to *final_dir* itself, since a cross-device move
+    would copy every PDF."""
 
-        print(f"GeroScience routine.")
-        doi = _extract_doi(entry)
-        if not doi:
-            doi = _extract_doi_from_url(getattr(entry, "link", ""))
-        print(f"Doi appears to be: {doi}")
-        if doi:
-            script = _BASE_DIR / "pdf_fetch_geroscience.sh"
-            cmd = [str(script), doi]
-            print(f"Running GeroScience script: {' '.join(cmd)}")
-            try:
-                subprocess.run(cmd, cwd=dest_dir, check=True)
-                used_custom = True
-            except Exception as exc:
-                print(f"GeroScience script failed: {exc}")
+    try:
+        if os.stat(dest_dir).st_dev == os.stat(final_dir).st_dev:
+            return dest_dir
+    except OSError:
+        return dest_dir
+    print(f"{dest_dir} is on a different filesystem from {final_dir}; staging in {final_dir}.")
+    return final_dir
 
-    if not used_custom:
-        _llm_shell_commands(entry, dest_dir)
 
-    after = set(dest_dir.glob("*.pdf"))
-    new_files = sorted(after - before, key=lambda p: p.name)
+def _download_pdf(entry, dest_dir: Path) -> Path | None:
+    """Try to download a PDF for *entry* into *dest_dir*.
 
-    valid_pdfs = []
-    for pdf in new_files:
-        if _pdf_file_valid(pdf):
-            valid_pdfs.append(pdf)
-        else:
-            pdf.unlink(missing_ok=True)
+    The caller is responsible for making sure *dest_dir* exists."""
 
-    if not valid_pdfs:
-        return None
+    # Resolved once here and shared with the fetchers and the final rename.
+    doi = getattr(entry, "doi", None) or _extract_doi(entry)
 
-    chosen = valid_pdfs[0]
-    for extra in valid_pdfs[1:]:
-        extra.unlink(missing_ok=True)
+    # Fetch into a private scratch directory so new files can be found without
+    # diffing the (potentially huge) contents of *dest_dir*.
+    final_dir = _PDF_DIR
+    scratch = _scratch_parent(Path(dest_dir), final_dir)
+    with tempfile.TemporaryDirectory(prefix=".fetch-", dir=scratch) as work:
+        work_dir = Path(work)
+        doi = _run_pdf_fetchers(entry, work_dir, doi) or doi
+
+        with os.scandir(work_dir) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".pdf"))
+        new_files = [work_dir / name for name in names]
+        chosen = next((pdf for pdf in new_files if _pdf_file_valid(pdf)), None)
+        if chosen is None:
+            return None
 
-    # Move the final PDF to the canonical storage directory
-    final_dir = (_BASE_DIR / "../pdfs").resolve()
-    final_dir.mkdir(parents=True, exist_ok=True)
-    final_path = final_dir / chosen.name
-    try:
-        shutil.move(str(chosen), final_path)
-    except Exception:
-        # Fallback if moving fails for some reason
-        chosen.replace(final_path)
+        # Move the final PDF to the canonical storage directory under a name
+        # no existing PDF uses; staging on the same filesystem makes this a
+        # hard link plus unlink.
+        final_path = _move_to_free_name(chosen, final_dir)
 
-    doi = getattr(entry, "doi", None) or _extract_doi(entry)
     if not doi:
         doi = _extract_doi_from_pdf(final_path)
     fname = _doi_filename(doi)
     if fname:
         target = final_dir / f"{fname}{final_path.suffix}"
         if target != final_path:
+            # Linking claims the DOI name atomically; a PDF already stored
+            # under it (or a concurrent download of the same DOI) wins.
             try:
-                final_path.rename(target)
-                final_path = target
-            except Exception as exc:
+                os.link(final_path, target)
+            except FileExistsError:
+                print(f"{target.name} already exists; keeping {final_path.name}")
+            except OSError as exc:
                 print(f"DOI rename failed: {exc}")
+            else:
+                final_path.unlink()
+                final_path = target
 
     print(f"Downloaded PDF {final_path}")
     return final_path
@@ -1182,7 +2320,7 @@ def _cleanup_ocr_text(raw_text: str) -> str:
     if not raw_text:
         return ""
 
-    client = openai.OpenAI()
+    client = _openai_client()
     prompt = (
         "Below, I am pasting a scientific article that has been processed by OCR. "
         "I want you to clean up all the mistakes and reformat the text for readability. "
@@ -1195,12 +2333,12 @@ def _cleanup_ocr_text(raw_text: str) -> str:
     ]
 
     try:
-        resp = client.chat.completions.create(
+        return _stream_chat(
+            client,
             model=SPEAKING_MODEL,
             messages=messages,
             max_completion_tokens=14000,
         )
-        return resp.choices[0].message.content
     except Exception as exc:
         print(f"[OCR] LLM cleanup failed: {exc}")
         return raw_text
@@ -1210,16 +2348,7 @@ def _ocr_pdf_fallback(pdf_path: Path, txt_path: Path) -> Path | None:
     """Extract text directly from *pdf_path* when OCR binaries are unavailable."""
 
     try:
-        from PyPDF2 import PdfReader
-
-        reader = PdfReader(str(pdf_path))
-        raw_text = ""
-        for page in reader.pages:
-            try:
-                raw_text += page.extract_text() or ""
-            except Exception as exc:
-                print(f"[OCR] Failed to read page text during fallback: {exc}")
-                continue
+        raw_text = _pdf_text(pdf_path)
     except Exception as exc:
         print(f"[OCR] Fallback text extraction failed: {exc}")
         return None
@@ -1231,26 +2360,65 @@ def _ocr_pdf_fallback(pdf_path: Path, txt_path: Path) -> Path | None:
         print(f"[OCR] Failed to write fallback text: {exc}")
         return None
 
-    archive_path = pdf_path.with_suffix(".zip")
-    payload = cleaned_text.encode("utf-8") or b"Fallback OCR placeholder"
-    try:
-        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr("page-1.txt", payload)
-    except Exception as exc:
-        print(f"[OCR] Failed to create fallback archive: {exc}")
-
     print(f"[OCR] Saved fallback OCR text to {txt_path}")
     return txt_path
 
 
+def _bare_doi(doi: str) -> str:
+    """Return *doi* without any ``https://doi.org/`` or ``doi:`` prefix."""
+
+    doi = doi.strip()
+    lower = doi.lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "doi.org/", "doi:"):
+        if lower.startswith(prefix):
+            return doi[len(prefix):].strip()
+    return doi
+
+
+# CrossRef accepts several ``doi:`` filters in one works query; a few such
+# queries are sent at once, within CrossRef's concurrency limit.
+_CROSSREF_BATCH = 20
+_CROSSREF_WORKERS = 3
+
+
+def _crossref_journals(dois: Iterable[str]) -> Dict[str, str]:
+    """Return a mapping of lower-cased bare DOI to journal title.
+
+    DOIs are looked up :data:`_CROSSREF_BATCH` at a time with a single
+    filtered works query per batch, running :data:`_CROSSREF_WORKERS`
+    batches concurrently; DOIs CrossRef does not know are left out.
+    """
+
+    bare = list(dict.fromkeys(_bare_doi(d).lower() for d in dois if d))
+
+    def _lookup(chunk: list[str]) -> list:
+        query = ",".join(f"doi:{urllib.parse.quote(d, safe='/')}" for d in chunk)
+        url = f"https://api.crossref.org/works?filter={query}&rows={len(chunk)}"
+        try:
+            return _crossref_json(url).get("message", {}).get("items", [])
+        except Exception as exc:
+            print(f"CrossRef lookup failed: {exc}")
+            return []
+
+    chunks = [
+        bare[start:start + _CROSSREF_BATCH]
+        for start in range(0, len(bare), _CROSSREF_BATCH)
+    ]
+    journals: Dict[str, str] = {}
+    for items in _parallel_map(_lookup, chunks, workers=_CROSSREF_WORKERS):
+        for item in items:
+            if item.get("DOI") and item.get("container-title"):
+                journals[item["DOI"].lower()] = item["container-title"][0]
+    return journals
+
+
 def fetch_pdf_for_article(title: str, dest_dir: Path = _PDF_DIR) -> Path | None:
     """Try to fetch a PDF for *title* using CrossRef search."""
 
     query = urllib.parse.quote(title)
     url = f"https://api.crossref.org/works?query.title={query}&rows=1"
     try:
-        with urllib.request.urlopen(url) as resp:
-            data = json.load(resp)
+        data = _crossref_json(url)
     except Exception as exc:
         print(f"CrossRef lookup failed: {exc}")
         return None
@@ -1277,61 +2445,48 @@ def fetch_pdf_for_article(title: str, dest_dir: Path = _PDF_DIR) -> Path | None:
     if doi:
         entry.doi = link
 
+    dest_dir.mkdir(parents=True, exist_ok=True)
     return _download_pdf(entry, dest_dir)
 
 
 def fetch_pdf_for_doi(doi: str, dest_dir: Path = _PDF_DIR) -> Path | None:
     """Try to fetch a PDF for *doi* using CrossRef metadata."""
 
-    doi = doi.strip()
-    lower = doi.lower()
-    for prefix in ("https://doi.org/", "http://doi.org/", "doi.org/", "doi:"):
-        if lower.startswith(prefix):
-            doi = doi[len(prefix):].strip()
-            lower = doi.lower()
-            break
-
+    doi = _bare_doi(doi)
     api_url = f"https://api.crossref.org/works/{urllib.parse.quote(doi)}"
     title = ""
     journal = ""
     try:
-        with urllib.request.urlopen(api_url) as resp:
-            data = json.load(resp)
-            msg = data.get("message", {})
-            if msg.get("title"):
-                title = msg["title"][0]
-            if msg.get("container-title"):
-                journal = msg["container-title"][0]
+        msg = _crossref_json(api_url).get("message", {})
+        if msg.get("title"):
+            title = msg["title"][0]
+        if msg.get("container-title"):
+            journal = msg["container-title"][0]
     except Exception as exc:
         print(f"CrossRef lookup failed: {exc}")
 
     link = f"https://doi.org/{doi}"
 
-    # Load the article store and either locate or create a matching item
-    articles: Dict[str, dict] = {}
+    # Locate a matching item in the store, or create one.  The cached store is
+    # shared, so the article is copied and saved back on its own.
     try:
-        with _ARTICLES_JSON.open("r", encoding="utf-8") as fh:
-            articles = json.load(fh)
+        article_key = _doi_index(_ARTICLES_JSON).get(link)
+        article = _load_articles_cached(_ARTICLES_JSON).get(article_key)
     except Exception:
-        articles = {}
-
-    article_key = None
-    article = None
-    for key, data in articles.items():
-        if data.get("doi") == link:
-            article_key = key
-            article = data
-            break
+        article_key = article = None
 
-    if article is None:
-        article_key = link
+    if isinstance(article, dict):
+        article = dict(article)
+    else:
+        article_key = _article_key(link)
         article = {
+            "id": link,
             "title": title or doi,
             "link": link,
             "journal": journal,
             "doi": link,
         }
-        articles[article_key] = article
+    articles = {article_key: article}
 
     class Entry:
         pass
@@ -1342,6 +2497,7 @@ def fetch_pdf_for_doi(doi: str, dest_dir: Path = _PDF_DIR) -> Path | None:
     entry.journal = article.get("journal", journal)
     entry.doi = link
 
+    dest_dir.mkdir(parents=True, exist_ok=True)
     pdf_path = _download_pdf(entry, dest_dir)
     article["download_successful"] = pdf_path is not None
     if pdf_path:
@@ -1368,7 +2524,7 @@ def fetch_pdf_for_doi(doi: str, dest_dir: Path = _PDF_DIR) -> Path | None:
             raw_text = ""
 
         if raw_text:
-            client = openai.OpenAI()
+            client = _openai_client()
             messages = [
                 {
                     "role": "system",
@@ -1376,7 +2532,10 @@ def fetch_pdf_for_doi(doi: str, dest_dir: Path = _PDF_DIR) -> Path | None:
                         "Identify and return only the complete Abstract section from the following OCR extracted text."
                     ),
                 },
-                {"role": "user", "content": raw_text[:20000]},
+                {
+                    "role": "user",
+                    "content": _truncate_tokens(raw_text, _ABSTRACT_PROMPT_TOKENS),
+                },
             ]
 
             try:
@@ -1400,6 +2559,90 @@ def fetch_pdf_for_doi(doi: str, dest_dir: Path = _PDF_DIR) -> Path | None:
     return pdf_path
 
 
+class _PublisherPacer:
+    """Space out downloads from the same publisher by a random delay.
+
+    Downloads from different publishers proceed without waiting on each
+    other; the delay only applies between requests sharing a key."""
+
+    def __init__(self) -> None:
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, key: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(key, now))
+            self._next[key] = start + random.uniform(*_DOWNLOAD_DELAY)
+        if start > now:
+            time.sleep(start - now)
+
+
+def _publisher_key(entry) -> str:
+    """Return the pacing key for *entry*: its journal, else its link's host."""
+
+    journal = (getattr(entry, "journal", "") or "").strip().lower()
+    if journal:
+        return journal
+    return urllib.parse.urlparse(getattr(entry, "link", "") or "").netloc.lower()
+
+
+def _download_pdfs(entries: Sequence, dest_dir: Path):
+    """Download PDFs for *entries* concurrently.
+
+    Yields ``(index, pdf_path, doi)`` as each download finishes, where
+    *index* is the entry's position in *entries*, *pdf_path* is ``None`` on
+    failure and *doi* is the DOI discovered for a successful download."""
+
+    pacer = _PublisherPacer()
+
+    def _work(entry):
+        pacer.wait(_publisher_key(entry))
+        pdf_path = _download_pdf(entry, dest_dir)
+        doi = _discover_doi(entry, pdf_path) if pdf_path else ""
+        return pdf_path, doi
+
+    with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS) as pool:
+        futures = {pool.submit(_work, entry): i for i, entry in enumerate(entries)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                pdf_path, doi = future.result()
+            except Exception as exc:
+                print(f"Download failed for {getattr(entries[index], 'link', '')}: {exc}")
+                pdf_path, doi = None, ""
+            yield index, pdf_path, doi
+
+
+def _feed_validators_path(json_path: Path) -> Path:
+    """Return the sidecar holding feed ETag/Last-Modified values for *json_path*."""
+
+    return Path(json_path).with_suffix(".feeds.json")
+
+
+def _parse_feed(feed_url: str, validators: dict | None):
+    """Parse *feed_url*, sending a conditional request when *validators* allow.
+
+    *validators* holds the ``etag`` and ``modified`` values returned the last
+    time the feed was read; feedparser then reports ``status`` 304 and no
+    entries when the feed has not changed.  Returns ``None`` if the feed
+    could not be fetched at all."""
+
+    # Entry summaries are reduced to plain text by ``_strip_html``, so
+    # feedparser's per-entry HTML sanitiser and relative-URI rewriting are
+    # wasted work.
+    options = {"sanitize_html": False, "resolve_relative_uris": False}
+    if validators:
+        options["etag"] = validators.get("etag")
+        options["modified"] = validators.get("modified")
+    try:
+        return _fp.parse(feed_url, **options)
+    except Exception as exc:
+        # One broken feed should not abort the other feeds fetched alongside it.
+        print(f"Failed to fetch feed {feed_url}: {exc}")
+        return None
+
+
 def fetch_recent_articles(
     opml_source: str | Path,
     hours: int = 24,
@@ -1414,89 +2657,185 @@ def fetch_recent_articles(
     articles : dict
         Keys are stable article IDs; values contain standardized article metadata.
     """
-    cutoff = _dt.datetime.now(_dt.timezone.utc) - _dt.timedelta(hours=hours)
+    now = _dt.datetime.now(_dt.timezone.utc)
+    cutoff = now - _dt.timedelta(hours=hours)
+    # feedparser dates are UTC struct_times, so plain tuple comparison avoids
+    # building a datetime for every (mostly stale) entry.
+    cutoff_tuple = cutoff.timetuple()[:6]
+    added = now.isoformat()
     articles: Dict[str, dict] = {}
+    run_journal = None
+    if json_path is not None:
+        # Fold in anything an interrupted earlier run left in its journal.
+        _compact_articles(json_path)
+        run_journal = _RunJournal(json_path)
+    known = _load_articles(json_path)
+    validators: Dict[str, dict] = {}
+    if json_path is not None:
+        validators = _load_articles(_feed_validators_path(json_path))
 
     _debug(
         "Starting fetch_recent_articles with opml_source={source}, hours={hours}, "
-        "download_pdfs={download}, json_path={json}. Cutoff timestamp: {cutoff}.".format(
-            source=opml_source,
-            hours=hours,
-            download=download_pdfs,
-            json=json_path,
-            cutoff=cutoff.isoformat(),
-        )
+        "download_pdfs={download}, json_path={json}. Cutoff timestamp: {cutoff}.",
+        source=opml_source,
+        hours=hours,
+        download=download_pdfs,
+        json=json_path,
+        cutoff=cutoff.isoformat(),
+    )
+
+    downloads: list[tuple[str, Any]] = []
+    feeds = _extract_feed_urls(opml_source, with_titles=True)
+    # Download and parse every feed concurrently; entries are still processed
+    # one at a time below so PDF fetches keep their polite pacing.
+    # A feed unchanged since the last run can only be skipped if that run
+    # already looked at least as far back as this one does.  Runs that
+    # download PDFs always read every feed so earlier failures are retried.
+    def _conditional(feed_url: str) -> dict | None:
+        seen = validators.get(feed_url)
+        if download_pdfs or not seen or seen.get("cutoff", "") > cutoff.isoformat():
+            return None
+        return seen
+
+    parsed_feeds = _parallel_map(
+        lambda feed_url: _parse_feed(feed_url, _conditional(feed_url)),
+        [feed_url for feed_url, _ in feeds],
+        workers=_FEED_WORKERS,
     )
 
-    for feed_url, rss_title in _extract_feed_urls(opml_source, with_titles=True):
-        parsed = _fp.parse(feed_url)
+    new_validators: Dict[str, dict] = {}
+    for (feed_url, rss_title), parsed in zip(feeds, parsed_feeds):
+        if parsed is None:
+            continue
+        if getattr(parsed, "status", None) == 304:
+            _debug("Feed {url} unchanged since the last run.", url=feed_url)
+            new_validators[feed_url] = validators[feed_url]
+            continue
+        etag = getattr(parsed, "etag", None)
+        modified = getattr(parsed, "modified", None)
+        if etag or modified:
+            new_validators[feed_url] = {
+                "etag": etag,
+                "modified": modified,
+                "cutoff": cutoff.isoformat(),
+            }
         total_entries = len(getattr(parsed, "entries", []))
         _debug(
-            "Processing feed '{title}' ({url}). Total entries: {total}.".format(
-                title=rss_title or "<untitled>", url=feed_url, total=total_entries
-            )
+            "Processing feed '{title}' ({url}). Total entries: {total}.",
+            title=rss_title or "<untitled>",
+            url=feed_url,
+            total=total_entries,
         )
         if getattr(parsed, "bozo", False):
             _debug(
-                "Feedparser reported an issue with {url}: {error}".format(
-                    url=feed_url,
-                    error=getattr(parsed, "bozo_exception", "unknown error"),
-                )
+                "Feedparser reported an issue with {url}: {error}",
+                url=feed_url,
+                error=getattr(parsed, "bozo_exception", "unknown error"),
             )
 
         matched_entries = 0
+        pending = []
 
         for entry in parsed.entries:
-            ts = _entry_timestamp(entry)
-            if ts is None or ts < cutoff:
+            ts = _entry_time_tuple(entry)
+            if ts is None or ts < cutoff_tuple:
                 continue
             matched_entries += 1
 
             # Compose a unique, deterministic key
-            key = f"{entry.get('id', entry.link)}"
-            link = entry.get("link", "")
-            if "fightaging.org" in urllib.parse.urlparse(link).netloc:
-                new_link, doi, journal = _resolve_fightaging_item(link)
-                entry["link"] = new_link
-                entry.link = new_link
-                if doi:
-                    entry["doi"] = doi
-                if journal:
-                    entry["dc_source"] = journal
+            identifier = f"{entry.get('id', entry.link)}"
+            key = _article_key(identifier)
+            previous = known.get(key)
+            if previous is None and identifier in known:
+                # Stores written before hashed keys were introduced.
+                key = identifier
+                previous = known[key]
+            if isinstance(previous, dict) and (
+                not download_pdfs
+                or _recently_attempted(previous, now)
+                or (previous.get("pdf") and (_PDF_DIR / previous["pdf"]).is_file())
+            ):
+                # Already stored, and either downloaded (with the PDF still
+                # on disk), recently failed, or this run is not downloading:
+                # rebuilding it would only repeat the Fight Aging! lookups
+                # and drop stored fields.
+                articles[key] = previous
+                continue
+            pending.append((entry, identifier, key))
+
+        fightaging = [
+            entry
+            for entry, _, _ in pending
+            if "fightaging.org" in urllib.parse.urlparse(entry.get("link", "")).netloc
+        ]
+        resolved = _parallel_map(
+            lambda entry: _resolve_fightaging_item(entry.get("link", "")),
+            fightaging,
+            workers=_LLM_WORKERS,
+        )
+        for entry, (new_link, doi, journal) in zip(fightaging, resolved):
+            entry["link"] = new_link
+            entry.link = new_link
+            if doi:
+                entry["doi"] = doi
+            if journal:
+                entry["dc_source"] = journal
 
-            article = _entry_to_article_data(entry)
+        for entry, identifier, key in pending:
+            article = _entry_to_article_data(entry, now=added)
+            article["id"] = identifier
             article["rsstitle"] = rss_title
             articles[key] = article
             if download_pdfs:
-                pdf_path = _download_pdf(entry, _PDF_DIR)
-                articles[key]["download_successful"] = pdf_path is not None
-                if pdf_path:
-                    rel = pdf_path.relative_to(_PDF_DIR)
-                    articles[key]["pdf"] = str(rel)
-                    doi = _discover_doi(entry, pdf_path)
-                    if doi:
-                        articles[key]["doi"] = doi
-                print(f"An update was made. {str(rel)}, {doi}")
-                time.sleep(random.uniform(5, 10))
+                # Downloaded together with every other feed's entries below.
+                downloads.append((key, entry))
+                continue
+            if run_journal is not None:
+                run_journal.append(key, articles[key])
             print(entry.title)
 
         _debug(
-            "Feed '{title}' contributed {matched} entries newer than cutoff.".format(
-                title=rss_title or "<untitled>", matched=matched_entries
-            )
+            "Feed '{title}' contributed {matched} entries newer than cutoff.",
+            title=rss_title or "<untitled>",
+            matched=matched_entries,
         )
 
+    results = _download_pdfs([entry for _, entry in downloads], _PDF_DIR)
+    for index, pdf_path, doi in results:
+        key, entry = downloads[index]
+        article = articles[key]
+        article["download_successful"] = pdf_path is not None
+        if pdf_path:
+            article["pdf"] = str(pdf_path.relative_to(_PDF_DIR))
+            if doi:
+                article["doi"] = doi
+        else:
+            article["last_attempt"] = now.isoformat()
+        print(f"An update was made. {article.get('pdf')}, {article.get('doi')}")
+        if run_journal is not None:
+            run_journal.append(key, article)
+        print(entry.title)
+
     if json_path is not None:
         _debug(
-            f"Completed aggregation of {len(articles)} articles. Writing to {json_path}."
+            "Completed aggregation of {count} articles. Writing to {path}.",
+            count=len(articles),
+            path=json_path,
         )
         _save_articles(articles, Path(json_path))
+        run_journal.discard()
+        # Only recorded once the articles they cover are safely stored.
+        try:
+            _feed_validators_path(json_path).write_bytes(_dump_store(new_validators))
+        except OSError as exc:
+            print(f"Failed to record feed validators: {exc}")
     else:
         _debug(
-            f"Completed aggregation of {len(articles)} articles. Skipping write step."
+            "Completed aggregation of {count} articles. Skipping write step.",
+            count=len(articles),
         )
 
-    _debug(f"fetch_recent_articles returning {len(articles)} articles.")
+    _debug("fetch_recent_articles returning {count} articles.", count=len(articles))
     return articles
 
 
@@ -1513,21 +2852,21 @@ def download_missing_pdfs(
     max_articles : int or None, optional
         If given, limit the number of PDFs fetched to at most this many.
     """
-    if not json_path.is_file():
+    # Fold in downloads journaled by an interrupted earlier run.
+    _compact_articles(json_path)
+    try:
+        articles = _parse_store(json_path.read_bytes())
+    except FileNotFoundError:
         print(f"JSON file not found: {json_path}")
         return
 
-    with json_path.open("r", encoding="utf-8") as fh:
-        articles = json.load(fh)
-
-    updated = False
-    processed = 0
+    pending: list[tuple[str, dict, Any]] = []
     for key, data in articles.items():
         if data.get("pdf"):
             continue
         if data.get("download_successful") is False:
             continue
-        if max_articles is not None and processed >= max_articles:
+        if max_articles is not None and len(pending) >= max_articles:
             break
 
         class Entry:
@@ -1535,7 +2874,7 @@ def download_missing_pdfs(
 
         entry = Entry()
         entry.title = data.get("title", "")
-        link = data.get("link") or key
+        link = data.get("link") or data.get("id") or key
         if not link:
             doi = data.get("doi")
             if doi:
@@ -1547,21 +2886,41 @@ def download_missing_pdfs(
             or data.get("source")
             or ""
         )
-        
-        pdf_path = _download_pdf(entry, _PDF_DIR)
-        data["download_successful"] = pdf_path is not None
-        if pdf_path:
-            rel = pdf_path.relative_to(_PDF_DIR)
-            data["pdf"] = str(rel)
-            doi = _discover_doi(entry, pdf_path)
-            if doi:
-                data["doi"] = doi
-        updated = True
-        processed += 1
-        time.sleep(random.uniform(5, 10))
+        pending.append((key, data, entry))
+
+    # Without a journal the publisher-specific fetchers cannot be chosen, so
+    # look those up from CrossRef in batches before downloading.
+    unknown = [
+        data["doi"] for _, data, entry in pending if not entry.journal and data.get("doi")
+    ]
+    if unknown:
+        journals = _crossref_journals(unknown)
+        for _, data, entry in pending:
+            if not entry.journal and data.get("doi"):
+                journal = journals.get(_bare_doi(data["doi"]).lower())
+                if journal:
+                    entry.journal = data["journal"] = journal
 
+    updated = False
+    run_journal = _RunJournal(json_path)
+    try:
+        # Each result is journaled as it lands; the store itself is rewritten
+        # once, after the batch.
+        results = _download_pdfs([entry for _, _, entry in pending], _PDF_DIR)
+        for index, pdf_path, doi in results:
+            key, data, _ = pending[index]
+            data["download_successful"] = pdf_path is not None
+            if pdf_path:
+                rel = pdf_path.relative_to(_PDF_DIR)
+                data["pdf"] = str(rel)
+                if doi:
+                    data["doi"] = doi
+            updated = True
+            run_journal.append(key, data)
+    finally:
         if updated:
             _save_articles(articles, json_path)
+        run_journal.discard()
 
 
 def download_journal_pdfs(
@@ -1574,33 +2933,36 @@ def download_journal_pdfs(
     The ``journal`` comparison is case-insensitive. If *max_articles* is
     provided, stop after that many PDFs have been downloaded.
     """
-    if not json_path.is_file():
+    _compact_articles(json_path)
+    try:
+        # One parse serves both the journal index and the records; the store
+        # is shared, so only the records updated here are copied.
+        _, store, index, _ = _cached_store(Path(json_path))
+    except FileNotFoundError:
         print(f"JSON file not found: {json_path}")
         return
 
-    with json_path.open("r", encoding="utf-8") as fh:
-        articles = json.load(fh)
-
     target = journal.strip().lower()
-    updated = False
-    processed = 0
-    for key, data in articles.items():
-        j = data.get("journal", "").strip().lower()
+    articles: Dict[str, dict] = {}
+    pending: list[tuple[str, dict, Any]] = []
+    for key in index.get(target, ()):
+        data = store.get(key)
         if (
-            j != target
+            not isinstance(data, dict)
             or data.get("pdf")
             or data.get("download_successful") is True
         ):
             continue
-        if max_articles is not None and processed >= max_articles:
+        if max_articles is not None and len(pending) >= max_articles:
             break
+        data = articles[key] = dict(data)
 
         class Entry:
             pass
 
         entry = Entry()
         entry.title = data.get("title", "")
-        link = data.get("link") or key
+        link = data.get("link") or data.get("id") or key
         if not link:
             doi = data.get("doi")
             if doi:
@@ -1614,24 +2976,30 @@ def download_journal_pdfs(
         print(f"Title: {entry.title}")
         print(f"Link: {entry.link}")
         print(f"DOI: {getattr(entry, 'doi', '')}")
+        pending.append((key, data, entry))
 
-        pdf_path = _download_pdf(entry, _PDF_DIR)
-        print(f"PDF Path is {pdf_path}")
-        data["download_successful"] = pdf_path is not None
-        doi = None
-        if pdf_path:
-            rel = pdf_path.relative_to(_PDF_DIR)
-            data["pdf"] = str(rel)
-            doi = _discover_doi(entry, pdf_path)
-            if doi:
-                data["doi"] = doi
-        updated = True
-        processed += 1
-        print(f"How far did we get? {doi}")
-        time.sleep(random.uniform(5, 10))
-
-    if updated:
-        _save_articles(articles, json_path)
+    updated = False
+    run_journal = _RunJournal(json_path)
+    try:
+        # Each result is journaled as it lands; the store itself is rewritten
+        # once, after the batch.
+        results = _download_pdfs([entry for _, _, entry in pending], _PDF_DIR)
+        for index, pdf_path, doi in results:
+            key, data, _ = pending[index]
+            print(f"PDF Path is {pdf_path}")
+            data["download_successful"] = pdf_path is not None
+            if pdf_path:
+                rel = pdf_path.relative_to(_PDF_DIR)
+                data["pdf"] = str(rel)
+                if doi:
+                    data["doi"] = doi
+            updated = True
+            print(f"How far did we get? {doi or None}")
+            run_journal.append(key, data)
+    finally:
+        if updated:
+            _save_articles(articles, json_path)
+        run_journal.discard()
 
 
 def pending_journal_articles(
@@ -1644,53 +3012,118 @@ def pending_journal_articles(
     matches the journal name and lacks a stored PDF or a successful download
     flag.
     """
-    if not json_path.is_file():
-        return False
-
     try:
-        with json_path.open("r", encoding="utf-8") as fh:
-            articles = json.load(fh)
+        articles = _load_articles_cached(json_path)
+        keys = _journal_index(json_path).get(journal.strip().lower(), ())
     except Exception:
         return False
 
-    target = journal.strip().lower()
-    for data in articles.values():
-        j = data.get("journal", "").strip().lower()
-        if j != target:
-            continue
-        if data.get("pdf") or data.get("download_successful") is True:
-            continue
-        return True
-
-    return False
+    return any(
+        not articles[key].get("pdf")
+        and articles[key].get("download_successful") is not True
+        for key in keys
+    )
 
 
 def journals_with_pending_articles(
     json_path: Path = _ARTICLES_JSON,
 ) -> dict[str, str]:
     """Return a mapping of lower journal names to canonical names for pending articles."""
-    if not json_path.is_file():
-        return {}
-
     try:
-        with json_path.open("r", encoding="utf-8") as fh:
-            articles = json.load(fh)
+        articles = _load_articles_cached(json_path)
+        index = _journal_index(json_path)
     except Exception:
         return {}
 
     result: dict[str, str] = {}
-    for data in articles.values():
-        j = data.get("journal", "").strip()
-        if not j:
-            continue
-        if data.get("pdf") or data.get("download_successful") is True:
-            continue
-        lower = j.lower()
-        result.setdefault(lower, j)
+    for lower, keys in index.items():
+        for key in keys:
+            data = articles[key]
+            if data.get("pdf") or data.get("download_successful") is True:
+                continue
+            result[lower] = data["journal"].strip()
+            break
 
     return result
 
 
+# libyaml's loader is much faster than the pure-Python one when available.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_char_file(path: str, mtime_ns: int) -> dict:
+    with open(path, "r", encoding="utf-8") as fh:
+        return yaml.load(fh, Loader=_YAML_LOADER)
+
+
+def _load_char_file(char_file: Path | str) -> dict:
+    """Return the parsed character YAML, re-reading it only after it changes.
+
+    The result is shared between callers and must not be modified."""
+
+    path = Path(char_file)
+    return _parse_char_file(str(path), path.stat().st_mtime_ns)
+
+
+def _pack_by_tokens(lines: list[str], max_tokens: int, model: str) -> list[list[str]]:
+    """Greedily group *lines* into chunks of at most *max_tokens* tokens.
+
+    A single line longer than the budget becomes a chunk of its own."""
+
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for line in lines:
+        size = _count_tokens(line, model) + 1
+        if current and used + size > max_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _condense_papers(lines: list[str], model: str) -> list[str]:
+    """Return *lines*, or per-chunk digests of them if they exceed one prompt.
+
+    Paper lists that fit within :data:`_SUMMARY_CHUNK_TOKENS` are returned
+    unchanged.  Larger lists are split into chunks that each get a short
+    digest from the LLM, and those digests stand in for the papers."""
+
+    chunks = _pack_by_tokens(lines, _SUMMARY_CHUNK_TOKENS, model)
+    if len(chunks) <= 1:
+        return lines
+
+    client = _openai_client()
+
+    def _digest(chunk: list[str]) -> str:
+        try:
+            return _stream_chat(
+                client,
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "Summarise the key findings of each of the following "
+                            "papers in one or two sentences, keeping their numbers."
+                        ),
+                    },
+                    {"role": "user", "content": "\n".join(chunk)},
+                ],
+                max_completion_tokens=2000,
+            ).strip()
+        except Exception as exc:
+            print(f"LLM request failed: {exc}")
+            return _truncate_tokens("\n".join(chunk), 2000, model)
+
+    print(f"Condensing {len(lines)} papers in {len(chunks)} chunks.")
+    return _parallel_map(_digest, chunks, workers=_LLM_WORKERS)
+
+
 def summarize_articles(
     json_path: Path = _ARTICLES_JSON,
     model: str = SPEAKING_MODEL,
@@ -1701,16 +3134,14 @@ def summarize_articles(
     The *char_file* YAML is loaded so the ``PAPERS`` section can be filled with
     an itemised list of papers before sending the prompt to the LLM.
     """
-    if not Path(json_path).is_file():
+    try:
+        articles = _load_articles_cached(json_path)
+    except FileNotFoundError:
         print(f"JSON file not found: {json_path}")
         return ""
-
-    with Path(json_path).open("r", encoding="utf-8") as fh:
-        try:
-            articles = json.load(fh)
-        except Exception as exc:
-            print(f"Failed to load JSON: {exc}")
-            return ""
+    except Exception as exc:
+        print(f"Failed to load JSON: {exc}")
+        return ""
 
     text_chunks = []
     for data in articles.values():
@@ -1724,18 +3155,17 @@ def summarize_articles(
         return ""
 
     # Build the PAPERS section for the character prompt
-    papers_lines = ["PAPERS"]
+    papers_lines = []
     for idx, (title, abstract) in enumerate(text_chunks, 1):
         title = title or "(no title)"
         abstract = abstract or "(no abstract)"
         papers_lines.append(f"{idx}. {title} — {abstract}")
-    papers_lines.append("******")
-    papers_text = "\n".join(papers_lines)
+    papers_lines = _condense_papers(papers_lines, model)
+    papers_text = "\n".join(["PAPERS", *papers_lines, "******"])
 
     # Load the base character prompt and inject the papers list
     try:
-        with Path(char_file).open("r", encoding="utf-8") as fh:
-            core = yaml.safe_load(fh)
+        core = _load_char_file(char_file)
         char_section = core.get("prompts", {}).get("char", {})
         if isinstance(char_section, dict):
             parts = [
@@ -1752,7 +3182,7 @@ def summarize_articles(
         print(f"Failed to load char prompt: {exc}")
         char_prompt = papers_text
 
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [
         {"role": "system", "content": char_prompt},
         {"role": "user", "content": "Provide a short summary and discussion."},
@@ -1773,6 +3203,13 @@ def summarize_articles(
     return summary
 
 
+# Relevance scores appear as ``<<label: N>>`` after each ``[[SECTION i]]`` marker.
+_RE_RELEVANCE_SCORES = tuple(
+    (field, re.compile(rf"\[\[SECTION\s*{i}\]\].*?<<[^:>]*:\s*(\d+)\s*>>", re.I | re.S))
+    for i, field in ((1, "lt-relevance"), (2, "mt-relevance"), (3, "st-relevance"))
+)
+
+
 def analyze_article(
     abstract: str,
     pdf_path: Path,
@@ -1786,8 +3223,7 @@ def analyze_article(
     """
 
     try:
-        with Path(char_file).open("r", encoding="utf-8") as fh:
-            core = yaml.safe_load(fh)
+        core = _load_char_file(char_file)
         brain = core.get("prompts", {}).get("brain", {})
         preamble = brain.get("relevance_preamble", "")
         postamble = brain.get("relevance_postamble", "")
@@ -1798,16 +3234,16 @@ def analyze_article(
 
     prompt = f"{preamble}\n\n{abstract.strip()}\n\n{postamble}".strip()
 
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [{"role": "system", "content": prompt}]
 
     try:
-        resp = client.chat.completions.create(
+        analysis = _stream_chat(
+            client,
             model=THINKING_MODEL,
             messages=messages,
             max_completion_tokens=10000,
         )
-        analysis = resp.choices[0].message.content
     except Exception as exc:
         print(f"LLM analysis failed: {exc}")
         analysis = ""
@@ -1820,12 +3256,8 @@ def analyze_article(
 
     # Parse relevance scores from the analysis
     scores = {}
-    for i, field in [(1, "lt-relevance"), (2, "mt-relevance"), (3, "st-relevance")]:
-        m = re.search(
-            rf"\[\[SECTION\s*{i}\]\].*?<<[^:>]*:\s*(\d+)\s*>>",
-            analysis,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+    for field, pattern in _RE_RELEVANCE_SCORES:
+        m = pattern.search(analysis)
         if m:
             try:
                 scores[field] = int(m.group(1))
@@ -1834,8 +3266,7 @@ def analyze_article(
 
     if scores:
         try:
-            with _ARTICLES_JSON.open("r", encoding="utf-8") as fh:
-                articles = json.load(fh)
+            articles = _load_articles_cached(_ARTICLES_JSON)
         except Exception:
             articles = {}
 
@@ -1845,16 +3276,13 @@ def analyze_article(
         except Exception:
             rel = pdf_path.name
 
-        updated = False
-        for data in articles.values():
+        # The cached store is shared, so save an updated copy of the one
+        # matching record; _save_articles merges it into the file.
+        for key, data in articles.items():
             if data.get("pdf") == rel:
-                data.update(scores)
-                updated = True
+                _save_articles({key: {**data, **scores}}, _ARTICLES_JSON)
                 break
 
-        if updated:
-            _save_articles(articles, _ARTICLES_JSON)
-
     return analysis
 
 
@@ -1882,8 +3310,7 @@ def design_experiment_for_doi(
         return ""
 
     try:
-        with Path(char_file).open("r", encoding="utf-8") as fh:
-            core = yaml.safe_load(fh)
+        core = _load_char_file(char_file)
         brain = core.get("prompts", {}).get("brain", {})
         pre = brain.get("designer_preamble", "")
         post = brain.get("designer_postamble", "")
@@ -1893,7 +3320,7 @@ def design_experiment_for_doi(
         post = ""
 
     prompt = f"{pre}\n\n{full_text.strip()}\n\n{post}".strip()
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [{"role": "system", "content": prompt}]
 
     try:
@@ -1940,8 +3367,7 @@ def design_experiment_for_file(
         return ""
 
     try:
-        with Path(char_file).open("r", encoding="utf-8") as fh:
-            core = yaml.safe_load(fh)
+        core = _load_char_file(char_file)
         brain = core.get("prompts", {}).get("brain", {})
         pre = brain.get("designer_preamble", "")
         post = brain.get("designer_postamble", "")
@@ -1953,16 +3379,16 @@ def design_experiment_for_file(
 
     prompt = f"{pre}\n\n{full_text.strip()}\n\n{post}".strip()
     print(f"[DESIGN] Prompt length: {len(prompt)} characters")
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [{"role": "system", "content": prompt}]
 
     try:
-        resp = client.chat.completions.create(
+        design = _stream_chat(
+            client,
             model=THINKING_MODEL,
             messages=messages,
             max_completion_tokens=20000,
         )
-        design = resp.choices[0].message.content
         print("[DESIGN] Received design from LLM")
     except Exception as exc:
         print(f"[DESIGN] LLM design failed: {exc}")
@@ -1978,6 +3404,243 @@ def design_experiment_for_file(
     return design
 
 
+# Column patterns for rewriting single wellplate statements.
+_RE_SQL_INSERT_HEAD = re.compile(
+    r"(insert\s+into\s+trialsv2db)(?:\s*\(([^)]*)\))?", re.I
+)
+_RE_SQL_INSERT_COLUMNS = re.compile(r"insert\s+into\s+trialsv2db\s*\(([^)]*)\)", re.I)
+_RE_SQL_ALTER_COLUMN = re.compile(
+    r"(alter\s+(?:table\s+)?trialsv2db\s+add\s+column\s+)([^\s]+)", re.I
+)
+
+_SQL_QUOTES = "'\"`"
+
+
+def _sql_skip_quoted(sql: str, i: int) -> int:
+    """Return the index just past the quoted string that opens at *sql[i]*."""
+
+    quote = sql[i]
+    j = i + 1
+    while True:
+        j = sql.find(quote, j)
+        if j < 0:
+            return len(sql)
+        k = j
+        while k > i + 1 and sql[k - 1] == "\\":
+            k -= 1
+        if (j - k) % 2 == 0:
+            return j + 1
+        j += 1
+
+
+def _sql_statement_end(sql: str, i: int) -> int:
+    """Return the index of the first ``;`` at or after *i* outside quotes.
+
+    Returns -1 if there is none.  Only quote and semicolon positions are
+    visited, so the scan costs one ``str.find`` per token of interest."""
+
+    while True:
+        semi = sql.find(";", i)
+        if semi < 0:
+            return -1
+        quotes = [q for q in (sql.find(c, i, semi) for c in _SQL_QUOTES) if q >= 0]
+        if not quotes:
+            return semi
+        i = _sql_skip_quoted(sql, min(quotes))
+
+
+def _sql_words_end(low: str, i: int, words: Sequence[str]) -> int:
+    """Return where *words* (whitespace separated) end when found at *low[i]*."""
+
+    for n, word in enumerate(words):
+        if n:
+            start = i
+            while i < len(low) and low[i].isspace():
+                i += 1
+            if i == start:
+                return -1
+        if not low.startswith(word, i):
+            return -1
+        i += len(word)
+    return i
+
+
+def _iter_sql_statements(sql: str, keyword: str, *prefixes: Sequence[str]):
+    """Yield the statements in *sql* starting with any of *prefixes*.
+
+    *keyword* is the lower-case first word of every prefix and is used to
+    find candidate starts.  Statements run to the next unquoted ``;`` and
+    are yielded stripped and without it; text without a terminator is
+    ignored."""
+
+    low = sql.lower()
+    pos = low.find(keyword)
+    while pos >= 0:
+        if pos == 0 or not (low[pos - 1].isalnum() or low[pos - 1] == "_"):
+            if any(_sql_words_end(low, pos, words) >= 0 for words in prefixes):
+                end = _sql_statement_end(sql, pos)
+                if end < 0:
+                    # Possibly an unbalanced quote; fall back to the next ``;``.
+                    end = sql.find(";", pos)
+                if end < 0:
+                    return
+                yield sql[pos:end].strip()
+                pos = low.find(keyword, end + 1)
+                continue
+        pos = low.find(keyword, pos + len(keyword))
+
+
+def _split_insert(stmt: str) -> tuple[str, list[str], str] | None:
+    """Split an ``INSERT`` into its head, value groups and raw value text.
+
+    Returns ``None`` when the statement has no top-level ``VALUES``."""
+
+    low = stmt.lower()
+    depth = 0
+    values_at = -1
+    group_start = -1
+    groups: list[str] = []
+    i = 0
+    n = len(stmt)
+    while i < n:
+        c = stmt[i]
+        if c in _SQL_QUOTES:
+            i = _sql_skip_quoted(stmt, i)
+            continue
+        if c == "(":
+            if depth == 0 and values_at >= 0:
+                group_start = i
+            depth += 1
+        elif c == ")":
+            depth = max(depth - 1, 0)
+            if depth == 0 and group_start >= 0:
+                groups.append(stmt[group_start:i + 1])
+                group_start = -1
+        elif (
+            depth == 0
+            and values_at < 0
+            and low.startswith("values", i)
+            and not low[i - 1 : i].isalnum()
+            and not low[i + 6 : i + 7].isalnum()
+        ):
+            values_at = i
+            i += 6
+            continue
+        i += 1
+    if values_at < 0:
+        return None
+    return stmt[:values_at].strip(), groups, stmt[values_at + 6:].strip()
+
+
+def _extract_rows(sql: str) -> list[str]:
+    """Return a list of individual ``INSERT`` row strings."""
+
+    rows: list[str] = []
+    for stmt in _iter_sql_statements(sql, "insert", ("insert", "into")):
+        parts = _split_insert(stmt)
+        if parts is None:
+            rows.append(stmt)
+            continue
+        head, groups, values = parts
+        for g in groups or [values]:
+            rows.append(f"{head} VALUES {g}")
+    return rows
+
+
+def _extract_alters(sql: str) -> list[str]:
+    """Return a list of ``ALTER TABLE`` statements."""
+
+    return list(
+        _iter_sql_statements(
+            sql, "alter", ("alter", "table", "trialsv2db"), ("alter", "trialsv2db")
+        )
+    )
+
+
+def _append_column_value(stmt: str, column: str, value: str) -> str:
+    """Return *stmt* with ``column`` and ``value`` appended."""
+
+    parts = _split_insert(stmt.strip())
+    if parts is None or not parts[1]:
+        return stmt
+    head, groups, _ = parts
+    m = _RE_SQL_INSERT_HEAD.fullmatch(head)
+    if not m:
+        return stmt
+    prefix, cols = m.groups()
+    vals = groups[0][1:-1]
+    cols = ", ".join(filter(None, [cols.strip() if cols else "", column]))
+    vals = ", ".join(filter(None, [vals.strip(), value]))
+    return f"{prefix}({cols}) VALUES ({vals})"
+
+
+def _backtick_column(name: str) -> str:
+    name = name.strip()
+    if not name:
+        return name
+    if name.startswith("`") and name.endswith("`"):
+        return name
+    return f"`{name.strip('`')}" + "`"
+
+
+def _backtick_columns(sql: str) -> str:
+    """Return *sql* with all column names wrapped in backticks."""
+
+    insert_pat = _RE_SQL_INSERT_COLUMNS.search(sql)
+    if insert_pat:
+        cols = insert_pat.group(1)
+        col_list = [c.strip() for c in cols.split(",") if c.strip()]
+        cols_bt = ", ".join(_backtick_column(c) for c in col_list)
+        sql = sql[: insert_pat.start(1)] + cols_bt + sql[insert_pat.end(1):]
+
+    alter_pat = _RE_SQL_ALTER_COLUMN.search(sql)
+    if alter_pat:
+        col = alter_pat.group(2)
+        sql = sql[: alter_pat.start(2)] + _backtick_column(col) + sql[alter_pat.end(2):]
+
+    return sql
+
+
+# Statements parsed from each ``.schema.txt``, keyed by file name and kept in
+# the PDF directory so later runs only parse schemas that changed.  Bump the
+# version whenever the extraction logic changes.
+_SCHEMA_CACHE_NAME = ".schema_cache.json"
+_SCHEMA_CACHE_VERSION = 1
+
+# Number of distinct conditions a wellplate holds, and the (well, 1-based
+# condition) layout of the 24-well plate, written out in this order.
+_WELLPLATE_ROWS = 12
+_WELL_MAPPING: tuple[tuple[str, int], ...] = (
+    ("A1", 1), ("A2", 5), ("A3", 8), ("A4", 12), ("A5", 1), ("A6", 11),
+    ("B1", 2), ("B2", 6), ("B3", 9), ("B4", 3), ("B5", 10), ("B6", 7),
+    ("C1", 3), ("C2", 7), ("C3", 10), ("C4", 5), ("C5", 4), ("C6", 12),
+    ("D1", 4), ("D2", 8), ("D3", 11), ("D4", 6), ("D5", 2), ("D6", 9),
+)
+
+
+def _load_schema_cache(pdf_dir: Path) -> Dict[str, list]:
+    """Return ``{name: [mtime_ns, rows, alters]}`` saved in *pdf_dir*."""
+
+    try:
+        data = _parse_store((pdf_dir / _SCHEMA_CACHE_NAME).read_bytes())
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _SCHEMA_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_schema_cache(pdf_dir: Path, files: Dict[str, list]) -> None:
+    payload = {"version": _SCHEMA_CACHE_VERSION, "files": files}
+    tmp_path = pdf_dir / (_SCHEMA_CACHE_NAME + ".tmp")
+    try:
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, pdf_dir / _SCHEMA_CACHE_NAME)
+    except OSError as exc:
+        print(f"[BATCH] Failed to save schema cache: {exc}")
+
+
 def design_experiments_from_analyses(
     pdf_dir: Path = _PDF_DIR,
     char_file: Path | str = (_BASE_DIR / "danmccay.yaml"),
@@ -1990,14 +3653,21 @@ def design_experiments_from_analyses(
 
     today = _dt.datetime.now().date()
     week_ago = today - _dt.timedelta(days=7)
-    processed: list[Path] = []
-    analyses = list(Path(pdf_dir).glob("*.analysis.txt"))
+    # One directory listing answers every "does the sibling file exist" check.
+    with os.scandir(pdf_dir) as it:
+        entries = {entry.name: entry for entry in it}
+    analyses = [
+        Path(pdf_dir) / name for name in entries if name.endswith(".analysis.txt")
+    ]
     print(f"[BATCH] Found {len(analyses)} analysis file(s)")
 
+    eligible: list[Path] = []
     for analysis in analyses:
         print(f"[BATCH] Examining {analysis}")
         try:
-            mtime = _dt.datetime.fromtimestamp(analysis.stat().st_mtime).date()
+            mtime = _dt.datetime.fromtimestamp(
+                entries[analysis.name].stat().st_mtime
+            ).date()
             print(f"[BATCH] mtime for {analysis}: {mtime}")
         except Exception as exc:
             print(f"[BATCH] Failed to read mtime for {analysis}: {exc}")
@@ -2005,191 +3675,168 @@ def design_experiments_from_analyses(
         #if mtime != today:
         #    continue
 
-        txt_path = analysis.with_name(analysis.name.replace(".analysis.txt", ".txt"))
-        exp_path = txt_path.with_suffix(".exp.txt")
-        if not txt_path.is_file():
+        txt_name = analysis.name.replace(".analysis.txt", ".txt")
+        txt_path = analysis.with_name(txt_name)
+        if txt_name not in entries:
             print(f"[BATCH] Text file missing for {analysis}")
             continue
-        if exp_path.is_file():
+        if txt_path.with_suffix(".exp.txt").name in entries:
             print(f"[BATCH] Experiment already exists for {txt_path}")
             continue
+        eligible.append(txt_path)
 
+    def _design(txt_path: Path) -> Path:
         design_experiment_for_file(txt_path, char_file=char_file)
-        schematize_experiment(exp_path)
-        processed.append(txt_path)
+        schematize_experiment(txt_path.with_suffix(".exp.txt"))
         print(f"[BATCH] Completed processing for {txt_path}")
+        return txt_path
+
+    processed = _parallel_map(_design, eligible, workers=_DESIGN_WORKERS)
 
     candidates: set[Path] = set(processed)
-    for schema in Path(pdf_dir).glob("*.schema.txt"):
+    # Re-list the directory: schematizing above has written new schemas.
+    with os.scandir(pdf_dir) as it:
+        names = {entry.name: entry for entry in it}
+    schema_stats: Dict[str, os.stat_result] = {}
+    # Compare raw mtimes against local midnight a week ago.
+    week_ago_ts = _dt.datetime.combine(week_ago, _dt.time()).timestamp()
+    for name, entry in names.items():
+        if not name.endswith(".schema.txt"):
+            continue
         try:
-            mtime = _dt.datetime.fromtimestamp(schema.stat().st_mtime).date()
-        except Exception:
+            schema_stats[name] = entry.stat()
+        except OSError:
             continue
-        if mtime < week_ago:
+        if schema_stats[name].st_mtime < week_ago_ts:
             continue
-        base = schema.with_name(schema.name.replace(".schema.txt", ".txt"))
-        if base.is_file():
-            candidates.add(base)
+        base_name = name.replace(".schema.txt", ".txt")
+        if base_name in names:
+            candidates.add(Path(pdf_dir) / base_name)
 
     if candidates:
         print(f"[BATCH] {len(processed)} file(s) processed; updating wellplate")
         try:
-            with _ARTICLES_JSON.open("r", encoding="utf-8") as fh:
-                articles = json.load(fh)
+            articles = _load_articles_cached(_ARTICLES_JSON)
             print(f"[BATCH] Loaded article metadata from {_ARTICLES_JSON}")
         except Exception as exc:
             print(f"[BATCH] Failed to read articles JSON: {exc}")
             articles = {}
 
-        scores = {}
-        for data in articles.values():
-            if not isinstance(data, dict):
-                continue
-            pdf = data.get("pdf")
-            if not pdf:
-                continue
-            lt = data.get("lt-relevance", 0)
-            mt = data.get("mt-relevance", 0)
-            st = data.get("st-relevance", 0)
-            scores[pdf] = lt + 2 * mt + 3 * st
+        scores = {
+            data["pdf"]: data.get("lt-relevance", 0)
+            + 2 * data.get("mt-relevance", 0)
+            + 3 * data.get("st-relevance", 0)
+            for data in articles.values()
+            if isinstance(data, dict) and data.get("pdf")
+        }
+        scores_by_stem: Dict[str, int] = {}
+        shared_stems: set[str] = set()
+        for pdf, score in scores.items():
+            stem = os.path.splitext(os.path.basename(pdf))[0]
+            if stem in scores_by_stem:
+                shared_stems.add(stem)
+            scores_by_stem[stem] = score
+
+        pdf_root = Path(pdf_dir)
+        resolved_root = None
 
         def _score(p: Path) -> int:
+            nonlocal resolved_root
+            if p.stem not in shared_stems:
+                return scores_by_stem.get(p.stem, 0)
+            # Several articles share this stem; match on the relative path.
             pdf_rel = p.with_suffix(".pdf")
+            if pdf_rel.parent == pdf_root:
+                return scores.get(pdf_rel.name, 0)
+            if resolved_root is None:
+                resolved_root = pdf_root.resolve()
             try:
-                pdf_rel = pdf_rel.resolve().relative_to(Path(pdf_dir).resolve())
+                pdf_rel = pdf_rel.resolve().relative_to(resolved_root)
             except Exception:
                 pdf_rel = pdf_rel.name
             return scores.get(str(pdf_rel), 0)
 
-        ordered = sorted(candidates, key=lambda p: (-_score(p), p.name))
-
-        def _extract_rows(sql: str) -> list[str]:
-            """Return a list of individual ``INSERT`` row strings."""
-
-            stmts = re.findall(r"INSERT\s+INTO[^;]*;", sql, flags=re.I | re.S)
-            rows: list[str] = []
-            for stmt in stmts:
-                stmt = stmt.strip().rstrip(";")
-                if "values" in stmt.lower():
-                    head, tail = re.split(r"(?i)values", stmt, maxsplit=1)
-                    values = tail.strip()
-                    groups = re.findall(r"\([^)]*\)", values)
-                    if not groups:
-                        groups = [values]
-                    for g in groups:
-                        rows.append(f"{head.strip()} VALUES {g}")
-                else:
-                    rows.append(stmt)
-            return rows
-
-        def _extract_alters(sql: str) -> list[str]:
-            """Return a list of ``ALTER TABLE`` statements."""
-
-            pattern = r"ALTER\s+(?:TABLE\s+)?trialsv2db[^;]*;"
-            alters = re.findall(pattern, sql, flags=re.I | re.S)
-            return [a.strip().rstrip(";") for a in alters]
-
-        def _append_column_value(stmt: str, column: str, value: str) -> str:
-            """Return *stmt* with ``column`` and ``value`` appended."""
-            pattern = r"(?i)(insert\s+into\s+trialsv2db)(?:\s*\(([^)]*)\))?\s*values\s*\(([^)]*)\)"
-            m = re.match(pattern, stmt.strip())
-            if not m:
-                return stmt
-            prefix, cols, vals = m.groups()
-            cols = ", ".join(filter(None, [cols.strip() if cols else "", column]))
-            vals = ", ".join(filter(None, [vals.strip(), value]))
-            return f"{prefix}({cols}) VALUES ({vals})"
-
-        def _backtick_columns(sql: str) -> str:
-            """Return *sql* with all column names wrapped in backticks."""
-
-            def _bt(name: str) -> str:
-                name = name.strip()
-                if not name:
-                    return name
-                if name.startswith("`") and name.endswith("`"):
-                    return name
-                return f"`{name.strip('`')}" + "`"
-
-            insert_pat = re.search(r"(?i)insert\s+into\s+trialsv2db\s*\(([^)]*)\)", sql)
-            if insert_pat:
-                cols = insert_pat.group(1)
-                col_list = [c.strip() for c in cols.split(',') if c.strip()]
-                cols_bt = ", ".join(_bt(c) for c in col_list)
-                sql = sql[: insert_pat.start(1)] + cols_bt + sql[insert_pat.end(1):]
-
-            alter_pat = re.search(r"(?i)(alter\s+(?:table\s+)?trialsv2db\s+add\s+column\s+)([^\s]+)", sql)
-            if alter_pat:
-                col = alter_pat.group(2)
-                sql = sql[: alter_pat.start(2)] + _bt(col) + sql[alter_pat.end(2):]
-
-            return sql
+        score_by_path = {p: _score(p) for p in candidates}
+        ordered = sorted(candidates, key=lambda p: (-score_by_path[p], p.name))
 
         wellplate = Path(pdf_dir) / f"{today.isoformat()}_wellplate.txt"
         print(f"[BATCH] Writing wellplate to {wellplate}")
 
-        seen: set[str] = set()
+        # Rows are compared case-insensitively; keep only their hashes.
+        seen: set[int] = set()
         base_rows: list[str] = []
         alter_rows: list[str] = []
         total = 0
 
+        saved_cache = _load_schema_cache(Path(pdf_dir))
+        # Forget schemas that have since been deleted.
+        schema_cache = {n: v for n, v in saved_cache.items() if n in names}
+        cache_dirty = len(schema_cache) != len(saved_cache)
         for txt_path in ordered:
             schema_path = txt_path.with_suffix(".schema.txt")
-            if not schema_path.is_file():
-                continue
             try:
-                schema_text = schema_path.read_text(encoding="utf-8")
-            except Exception:
+                stat = schema_stats.get(schema_path.name) or schema_path.stat()
+            except OSError:
                 continue
-
-            rows = [_backtick_columns(r) for r in _extract_rows(schema_text) if r.strip()]
-            alters = [_backtick_columns(r) for r in _extract_alters(schema_text) if r.strip()]
+            cached = schema_cache.get(schema_path.name)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                rows, alters = cached[1], cached[2]
+            else:
+                try:
+                    schema_text = schema_path.read_text(encoding="utf-8")
+                except Exception:
+                    continue
+                # Backtick once here; rows are only appended to afterwards, with
+                # names that are already quoted.
+                rows = [_backtick_columns(r) for r in _extract_rows(schema_text) if r.strip()]
+                alters = [_backtick_columns(r) for r in _extract_alters(schema_text) if r.strip()]
+                schema_cache[schema_path.name] = [stat.st_mtime_ns, rows, alters]
+                cache_dirty = True
+            room = _WELLPLATE_ROWS - total
             unique_rows = []
             unique_alters = []
-            file_seen: set[str] = set()
+            file_seen: set[int] = set()
             for r in rows:
-                norm = r.strip().lower()
-                if norm not in seen and norm not in file_seen:
+                fp = hash(r.strip().lower())
+                if fp not in seen and fp not in file_seen:
                     unique_rows.append(r)
-                    file_seen.add(norm)
+                    file_seen.add(fp)
+                    if len(unique_rows) > room:
+                        break
+            if len(unique_rows) > room:
+                # The file would overflow the plate; skip it without
+                # looking at the rest of its rows or its alters.
+                continue
             for r in alters:
-                norm = r.strip().lower()
-                if norm not in seen and norm not in file_seen:
+                fp = hash(r.strip().lower())
+                if fp not in seen and fp not in file_seen:
                     unique_alters.append(r)
-                    file_seen.add(norm)
-            if total + len(unique_rows) > 12:
-                continue
+                    file_seen.add(fp)
+            seen |= file_seen
             for r in unique_alters:
-                seen.add(r.strip().lower())
-                alter_rows.append(_backtick_columns(r.rstrip(";").strip()) + ";")
+                alter_rows.append(r.rstrip(";").strip() + ";")
 
             for r in unique_rows:
-                seen.add(r.strip().lower())
-                base = _append_column_value(r.rstrip(";").strip(), "status", "'pending'")
-                base_rows.append(_backtick_columns(base))
+                base_rows.append(
+                    _append_column_value(r.rstrip(";").strip(), "`status`", "'pending'")
+                )
                 total += 1
-                if total >= 12:
-                    break
-            if total >= 12:
+            if total >= _WELLPLATE_ROWS:
                 break
 
-        mapping = [
-            ("A1", 1), ("A2", 5), ("A3", 8), ("A4", 12), ("A5", 1), ("A6", 11),
-            ("B1", 2), ("B2", 6), ("B3", 9), ("B4", 3), ("B5", 10), ("B6", 7),
-            ("C1", 3), ("C2", 7), ("C3", 10), ("C4", 5), ("C5", 4), ("C6", 12),
-            ("D1", 4), ("D2", 8), ("D3", 11), ("D4", 6), ("D5", 2), ("D6", 9),
-        ]
+        if cache_dirty:
+            _save_schema_cache(Path(pdf_dir), schema_cache)
 
-        final_rows = []
-        final_rows.extend(alter_rows)
-        for well, idx in mapping:
-            if 0 < idx <= len(base_rows):
-                row = _append_column_value(base_rows[idx - 1].rstrip(), "well", f"'{well}'")
-                final_rows.append(_backtick_columns(row).rstrip() + ";")
+        final_rows = alter_rows + [
+            _append_column_value(base_rows[idx - 1].rstrip(), "`well`", f"'{well}'").rstrip()
+            + ";"
+            for well, idx in _WELL_MAPPING
+            if idx <= len(base_rows)
+        ]
 
         try:
             with wellplate.open("w", encoding="utf-8") as wh:
-                wh.write("\n".join(final_rows) + ("\n" if final_rows else ""))
+                wh.writelines(f"{row}\n" for row in final_rows)
         except Exception as exc:
             print(f"Failed to create wellplate file: {exc}")
 
@@ -2221,8 +3868,7 @@ def schematize_experiment(
 
     # Load schematizer prompts from the character file
     try:
-        with (_BASE_DIR / "danmccay.yaml").open("r", encoding="utf-8") as fh:
-            core = yaml.safe_load(fh)
+        core = _load_char_file(_BASE_DIR / "danmccay.yaml")
         brain = core.get("prompts", {}).get("brain", {})
         pre = brain.get("schematizer_preamble", "")
         post = brain.get("schematizer_postamble", "")
@@ -2243,7 +3889,7 @@ def schematize_experiment(
     prompt = f"{pre}\n{schema_text.strip()}\n\n{post}".strip()
     print(f"[SCHEMA] Prompt length: {len(prompt)} characters")
 
-    client = openai.OpenAI()
+    client = _openai_client()
     messages = [
         {"role": "system", "content": prompt},
         {"role": "user", "content": first_para},
@@ -2320,8 +3966,11 @@ def ocr_pdf(pdf_name: str, pdf_dir: Path = _PDF_DIR) -> Path | None:
     if not attachments:
         attachments["docling_text.txt"] = cleaned_text
 
+    # The archive is rarely reopened, so favour compression speed over ratio.
     try:
-        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zipfile.ZipFile(
+            archive_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as zf:
             for name, content in attachments.items():
                 data = content.encode("utf-8") if isinstance(content, str) else content
                 zf.writestr(name, data)
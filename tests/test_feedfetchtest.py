@@ -10,6 +10,34 @@ import tempfile
 import feedfetchtest as fft
 import datetime as dt
 import importlib
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_http_disk_cache(monkeypatch):
+    # Keep fake pages served by tests out of the real on-disk page cache.
+    monkeypatch.setattr(fft, '_HTTP_CACHE_DB', None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_openai_client(monkeypatch):
+    # Each test builds the shared client from its own fake ``openai.OpenAI``.
+    monkeypatch.setattr(fft, '_OPENAI_CLIENT', None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_pdf_dir(monkeypatch, tmp_path_factory):
+    # Downloads land in a fresh PDF directory rather than the real ../pdfs.
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path_factory.mktemp('pdfs'))
+
+
+def _chat_reply(text, stream=False):
+    """Return a fake chat completion, as a one-chunk stream when *stream* is set."""
+    if stream:
+        delta = types.SimpleNamespace(content=text)
+        return iter([types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])])
+    message = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
 
 
 def test_extract_feed_urls():
@@ -39,6 +67,13 @@ def test_entry_timestamp():
     e3 = Entry()
     assert fft._entry_timestamp(e3) is None
 
+def test_entry_time_tuple():
+    class Entry: pass
+    e = Entry()
+    e.published_parsed = time.gmtime(60)
+    assert fft._entry_time_tuple(e) == (1970, 1, 1, 0, 1, 0)
+    assert fft._entry_time_tuple(Entry()) is None
+
 def test_strip_html():
     text = '<p>Hello <b>World</b></p>'
     assert fft._strip_html(text) == 'Hello World'
@@ -87,6 +122,9 @@ def test_entry_to_article_data(monkeypatch):
     # date-added should parse to datetime isoformat; check endswithZ
     assert data['num-retrievals'] == 0
     assert 'date-added' in data
+    assert fft._entry_to_article_data(e, now='2024-01-01T00:00:00')['date-added'] == (
+        '2024-01-01T00:00:00'
+    )
     assert data['lt-relevance'] == 0
 
 
@@ -173,6 +211,8 @@ def test_is_safe_command():
     assert not fft._is_safe_command('rm -rf /')
     assert not fft._is_safe_command('wget http://a && rm')
     assert not fft._is_safe_command('')
+    assert not fft._is_safe_command('wget http://a\nrm -rf /')
+    assert not fft._is_safe_command('wget "http://a')
 
 def test_pdf_file_valid(tmp_path):
     from PyPDF2 import PdfWriter
@@ -188,6 +228,14 @@ def test_pdf_file_valid(tmp_path):
     small.write_bytes(b'0'*100)
     assert not fft._pdf_file_valid(small)
 
+    html = tmp_path / 'h.pdf'
+    html.write_bytes(b'<html>' + b'x' * 20_000 + b'</html>')
+    assert not fft._pdf_file_valid(html)
+
+    truncated = tmp_path / 't.pdf'
+    truncated.write_bytes(valid.read_bytes()[:-2048])
+    assert not fft._pdf_file_valid(truncated)
+
 def test_download_pdf(monkeypatch, tmp_path):
     created = []
 
@@ -202,14 +250,16 @@ def test_download_pdf(monkeypatch, tmp_path):
     def fake_valid(path):
         return True
 
+    pdf_dir = tmp_path / 'pdfs'
+    pdf_dir.mkdir()
+    monkeypatch.setattr(fft, '_PDF_DIR', pdf_dir)
     monkeypatch.setattr(fft, '_llm_shell_commands', fake_llm)
     monkeypatch.setattr(fft, '_pdf_file_valid', fake_valid)
 
     class E: link='x'; title='t'
 
     result = fft._download_pdf(E(), tmp_path)
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'a.pdf'
-    assert result == expected
+    assert result == pdf_dir / 'a.pdf'
     assert not (tmp_path / 'b.pdf').exists()
     assert not (tmp_path / 'a.pdf').exists()
 
@@ -217,7 +267,7 @@ def test_download_pdf(monkeypatch, tmp_path):
 def test_download_pdf_aging_cell(monkeypatch, tmp_path):
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -236,16 +286,103 @@ def test_download_pdf_aging_cell(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('acel.70123')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1111_acel.70123.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1111_acel.70123.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
 
+def test_download_pdf_keeps_existing_file_with_same_name(monkeypatch, tmp_path):
+    pdf_dir = tmp_path / 'pdfs'
+    pdf_dir.mkdir()
+    (pdf_dir / 'x.pdf').write_bytes(b'old')
+
+    def fake_fetchers(entry, work_dir, doi):
+        (work_dir / 'x.pdf').write_bytes(b'new')
+        return doi
+
+    monkeypatch.setattr(fft, '_PDF_DIR', pdf_dir)
+    monkeypatch.setattr(fft, '_run_pdf_fetchers', fake_fetchers)
+    monkeypatch.setattr(fft, '_pdf_file_valid', lambda p: True)
+    monkeypatch.setattr(fft, '_extract_doi', lambda e: '')
+    monkeypatch.setattr(fft, '_extract_doi_from_pdf', lambda p: '')
+
+    class E:
+        link = 'x'
+        title = 't'
+
+    result = fft._download_pdf(E(), tmp_path)
+    assert result == pdf_dir / 'x_1.pdf'
+    assert result.read_bytes() == b'new'
+    assert (pdf_dir / 'x.pdf').read_bytes() == b'old'
+
+
+def test_download_pdf_keeps_existing_doi_named_file(monkeypatch, tmp_path):
+    existing = fft._PDF_DIR / 'doiorg10.1234_abc.pdf'
+    existing.write_bytes(b'old')
+
+    def fake_fetchers(entry, work_dir, doi):
+        (work_dir / 'x.pdf').write_bytes(b'new')
+        return doi
+
+    monkeypatch.setattr(fft, '_run_pdf_fetchers', fake_fetchers)
+    monkeypatch.setattr(fft, '_pdf_file_valid', lambda p: True)
+    monkeypatch.setattr(fft, '_extract_doi', lambda e: 'https://doi.org/10.1234/abc')
+
+    class E:
+        link = 'x'
+        title = 't'
+
+    result = fft._download_pdf(E(), tmp_path)
+    assert result == fft._PDF_DIR / 'x.pdf'
+    assert result.read_bytes() == b'new'
+    assert existing.read_bytes() == b'old'
+
+
+def test_run_pdf_fetchers_falls_back_after_script_timeout(monkeypatch, tmp_path):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    fallback = []
+    monkeypatch.setattr(fft.subprocess, 'run', fake_run)
+    monkeypatch.setattr(fft, '_llm_shell_commands', lambda e, d: fallback.append(d))
+    monkeypatch.setattr(fft, '_extract_doi', lambda e: 'https://doi.org/10.1111/acel.70123')
+
+    class E:
+        link = 'x'
+        title = 't'
+        journal = 'Aging Cell'
+
+    fft._run_pdf_fetchers(E(), tmp_path)
+    assert fallback == [tmp_path]
+
+
+def test_download_pdf_resolves_doi_once(monkeypatch, tmp_path):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
+        (Path(cwd) / 'a.pdf').write_bytes(b'd')
+        return subprocess.CompletedProcess(cmd, 0)
+
+    lookups = []
+    monkeypatch.setattr(fft.subprocess, 'run', fake_run)
+    monkeypatch.setattr(fft, '_pdf_file_valid', lambda p: True)
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft, '_extract_doi', lambda e: lookups.append(e) or '')
+    monkeypatch.setattr(fft, '_extract_doi_from_url', lambda u: 'https://doi.org/10.1/geo.5')
+
+    class E:
+        link = 'x'
+        title = 't'
+        journal = 'GeroScience'
+
+    result = fft._download_pdf(E(), tmp_path)
+    assert len(lookups) == 1
+    assert result == tmp_path / 'doiorg10.1_geo.5.pdf'
+
+
 def test_download_pdf_aging_cell_case_insensitive(monkeypatch, tmp_path):
     """Ensure journal comparison ignores capitalization."""
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -264,7 +401,7 @@ def test_download_pdf_aging_cell_case_insensitive(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('acel.70123')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1111_acel.70123.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1111_acel.70123.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -272,7 +409,7 @@ def test_download_pdf_aging_cell_case_insensitive(monkeypatch, tmp_path):
 def test_download_pdf_aging_us(monkeypatch, tmp_path):
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -291,7 +428,7 @@ def test_download_pdf_aging_us(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.18632/aging.206245')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.18632_aging.206245.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.18632_aging.206245.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -300,7 +437,7 @@ def test_download_pdf_aging_us_case_insensitive(monkeypatch, tmp_path):
     """Ensure Aging journal comparison ignores capitalization."""
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -319,7 +456,7 @@ def test_download_pdf_aging_us_case_insensitive(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.18632/aging.206245')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.18632_aging.206245.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.18632_aging.206245.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -327,7 +464,7 @@ def test_download_pdf_aging_us_case_insensitive(monkeypatch, tmp_path):
 def test_download_pdf_nataging(monkeypatch, tmp_path):
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -350,7 +487,7 @@ def test_download_pdf_nataging(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1038/s43587-025-00901-6')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1038_s43587-025-00901-6.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1038_s43587-025-00901-6.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -359,7 +496,7 @@ def test_download_pdf_nataging_case_insensitive(monkeypatch, tmp_path):
     """Ensure Nature Aging journal comparison ignores capitalization."""
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -382,7 +519,7 @@ def test_download_pdf_nataging_case_insensitive(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1038/s43587-025-00901-6')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1038_s43587-025-00901-6.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1038_s43587-025-00901-6.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -390,7 +527,7 @@ def test_download_pdf_nataging_case_insensitive(monkeypatch, tmp_path):
 def test_download_pdf_natcomms(monkeypatch, tmp_path):
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -413,7 +550,7 @@ def test_download_pdf_natcomms(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1038/s41467-025-01234-7')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1038_s41467-025-01234-7.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1038_s41467-025-01234-7.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -422,7 +559,7 @@ def test_download_pdf_natcomms_case_insensitive(monkeypatch, tmp_path):
     """Ensure Nature Communications journal comparison ignores capitalization."""
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -445,7 +582,7 @@ def test_download_pdf_natcomms_case_insensitive(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1038/s41467-025-01234-7')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1038_s41467-025-01234-7.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1038_s41467-025-01234-7.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -453,7 +590,7 @@ def test_download_pdf_natcomms_case_insensitive(monkeypatch, tmp_path):
 def test_download_pdf_geroscience(monkeypatch, tmp_path):
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -476,7 +613,7 @@ def test_download_pdf_geroscience(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1007/s11357-021-00469-0')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1007_s11357-021-00469-0.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1007_s11357-021-00469-0.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -485,7 +622,7 @@ def test_download_pdf_geroscience_case_insensitive(monkeypatch, tmp_path):
     """Ensure GeroScience journal comparison ignores capitalization."""
     calls = []
 
-    def fake_run(cmd, cwd=None, check=None):
+    def fake_run(cmd, cwd=None, check=None, timeout=None):
         calls.append(cmd)
         p = Path(cwd) / 'article_fulltest_version1.pdf'
         p.write_bytes(b'd')
@@ -508,7 +645,7 @@ def test_download_pdf_geroscience_case_insensitive(monkeypatch, tmp_path):
     result = fft._download_pdf(E(), tmp_path)
     assert calls
     assert calls[0][-1].endswith('10.1007/s11357-021-00469-0')
-    expected = (fft._BASE_DIR / '../pdfs').resolve() / 'doiorg10.1007_s11357-021-00469-0.pdf'
+    expected = fft._PDF_DIR / 'doiorg10.1007_s11357-021-00469-0.pdf'
     assert result == expected
     assert not (tmp_path / 'article_fulltest_version1.pdf').exists()
 
@@ -521,6 +658,7 @@ def test_save_articles(tmp_path):
     fft._save_articles({'k2': {}}, path)
     data2 = json.loads(path.read_text())
     assert set(data2.keys()) == {'k', 'k2'}
+    assert list(tmp_path.iterdir()) == [path]
 
 
 def test_save_articles_sanitizes_objects(tmp_path):
@@ -537,6 +675,51 @@ def test_save_articles_sanitizes_objects(tmp_path):
     assert stored['k']['title'] == 'Main'
     assert stored['k']['problem'] == {'title': 'E', 'link': 'L'}
 
+
+def test_save_articles_concurrent_writers(tmp_path):
+    import threading
+
+    path = tmp_path / 'a.json'
+    errors = []
+
+    def save(i):
+        try:
+            for j in range(20):
+                fft._save_articles({f'{i}-{j}': {'v': j}}, path)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert json.loads(path.read_text())
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_save_articles_keeps_store_json_accepts(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text(json.dumps({'old1': {'title': 'x\ud800y'}, 'old2': {'score': float('nan')}}))
+
+    fft._save_articles({'new': {'title': 'n'}}, path)
+
+    stored = json.loads(path.read_text())
+    assert set(stored) == {'old1', 'old2', 'new'}
+    assert stored['old1']['title'] == 'x\ud800y'
+
+
+def test_save_articles_leaves_unreadable_store_untouched(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text('{"old": {"title": ')
+
+    with pytest.raises(ValueError):
+        fft._save_articles({'new': {'title': 'n'}}, path)
+    assert path.read_text() == '{"old": {"title": '
+
+
 def test_fetch_recent_articles(monkeypatch, tmp_path):
     opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
 
@@ -555,12 +738,14 @@ def test_fetch_recent_articles(monkeypatch, tmp_path):
             self.link = 'L'
             self.title = 'T'
     parsed = Parsed([E()])
-    monkeypatch.setattr(fft._fp, 'parse', lambda url: parsed)
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
 
     articles = fft.fetch_recent_articles(opml, hours=1, json_path=None, download_pdfs=False)
-    assert 'ID' in articles
-    assert articles['ID']['title'] == 'T'
-    assert articles['ID']['rsstitle'] == 'FT'
+    key = fft._article_key('ID')
+    assert key in articles
+    assert articles[key]['id'] == 'ID'
+    assert articles[key]['title'] == 'T'
+    assert articles[key]['rsstitle'] == 'FT'
 
 def test_fetch_recent_articles_pdf_relative(monkeypatch, tmp_path):
     opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
@@ -581,7 +766,7 @@ def test_fetch_recent_articles_pdf_relative(monkeypatch, tmp_path):
             self.title = 'T'
 
     parsed = Parsed([E()])
-    monkeypatch.setattr(fft._fp, 'parse', lambda url: parsed)
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
 
     def fake_download(entry, dest):
         p = dest / 'p.pdf'
@@ -595,9 +780,61 @@ def test_fetch_recent_articles_pdf_relative(monkeypatch, tmp_path):
     monkeypatch.setattr(fft.random, 'uniform', lambda *a, **k: 0)
 
     articles = fft.fetch_recent_articles(opml, hours=1, json_path=None, download_pdfs=True)
-    assert articles['ID']['pdf'] == 'p.pdf'
-    assert articles['ID']['download_successful'] is True
-    assert articles['ID']['rsstitle'] == 'FT'
+    key = fft._article_key('ID')
+    assert articles[key]['pdf'] == 'p.pdf'
+    assert articles[key]['download_successful'] is True
+    assert articles[key]['rsstitle'] == 'FT'
+
+
+def test_fetch_recent_articles_skips_known(monkeypatch, tmp_path):
+    opml = (
+        '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/>'
+        '</body></opml>'
+    )
+
+    class Parsed:
+        def __init__(self, entries):
+            self.entries = entries
+
+    class E(dict):
+        def __init__(self, ident):
+            super().__init__()
+            self.published_parsed = time.gmtime(time.time())
+            self['title'] = ident
+            self['link'] = 'L'
+            self['id'] = ident
+            self['summary'] = ''
+            self.link = 'L'
+            self.title = ident
+
+    parsed = Parsed([E('DONE'), E('FAILED'), E('NEW')])
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
+
+    recent = dt.datetime.now(dt.timezone.utc).isoformat()
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({
+        'DONE': {'title': 'DONE', 'pdf': 'done.pdf', 'download_successful': True},
+        'FAILED': {'title': 'FAILED', 'download_successful': False, 'last_attempt': recent},
+    }))
+
+    attempts = []
+
+    def fake_download(entry, dest):
+        attempts.append(entry.title)
+        return None
+
+    monkeypatch.setattr(fft, '_download_pdf', fake_download)
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft.time, 'sleep', lambda *a, **k: None)
+    monkeypatch.setattr(fft.random, 'uniform', lambda *a, **k: 0)
+    (tmp_path / 'done.pdf').write_bytes(b'%PDF')
+
+    articles = fft.fetch_recent_articles(opml, hours=1, json_path=json_path, download_pdfs=True)
+    assert attempts == ['NEW']
+    assert articles['DONE']['pdf'] == 'done.pdf'
+    new_key = fft._article_key('NEW')
+    assert articles[new_key]['download_successful'] is False
+    assert 'last_attempt' in articles[new_key]
 
 
 def test_fightaging_special_case(monkeypatch):
@@ -621,7 +858,7 @@ def test_fightaging_special_case(monkeypatch):
             self.title = 'T'
 
     parsed = Parsed([E()])
-    monkeypatch.setattr(fft._fp, 'parse', lambda url: parsed)
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
 
     class Resp:
         def __init__(self, text):
@@ -636,6 +873,7 @@ def test_fightaging_special_case(monkeypatch):
             return 'https://www.fightaging.org/archives/a-post/'
 
     monkeypatch.setattr(fft.urllib.request, 'urlopen', lambda url: Resp(html))
+    fft._PAGE_MEMO.clear()
 
     called = []
     def fake_doi(url):
@@ -657,10 +895,11 @@ def test_fightaging_special_case(monkeypatch):
     monkeypatch.setattr(fft, 'openai', types.SimpleNamespace(OpenAI=lambda: FakeClient()))
 
     articles = fft.fetch_recent_articles(opml, hours=1, json_path=None, download_pdfs=False)
-    assert articles['ID']['doi'] == 'https://doi.org/10.1234/x'
-    assert articles['ID']['link'] == 'https://doi.org/10.1234/x'
-    assert articles['ID']['journal'] == 'J'
-    assert articles['ID']['rsstitle'] == 'FT'
+    key = fft._article_key('ID')
+    assert articles[key]['doi'] == 'https://doi.org/10.1234/x'
+    assert articles[key]['link'] == 'https://doi.org/10.1234/x'
+    assert articles[key]['journal'] == 'J'
+    assert articles[key]['rsstitle'] == 'FT'
     assert called == []
 
 def test_summarize_articles(monkeypatch, tmp_path):
@@ -782,6 +1021,31 @@ def test_download_missing_pdfs_key_fallback(monkeypatch, tmp_path):
     assert stored['https://example.com/a']['download_successful'] is True
 
 
+def test_download_missing_pdfs_hashed_key_uses_id(monkeypatch, tmp_path):
+    key = fft._article_key('https://example.com/a')
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({key: {'id': 'https://example.com/a', 'title': 't1', 'link': ''}}))
+
+    captured = []
+
+    def fake_download(entry, dest):
+        captured.append(entry.link)
+        p = dest / f"{entry.title}.pdf"
+        p.write_bytes(b'd')
+        return p
+
+    monkeypatch.setattr(fft, '_download_pdf', fake_download)
+    monkeypatch.setattr(fft, '_discover_doi', lambda *a, **k: '')
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft.time, 'sleep', lambda *a, **k: None)
+    monkeypatch.setattr(fft.random, 'uniform', lambda *a, **k: 0)
+
+    fft.download_missing_pdfs(json_path=json_path)
+
+    assert captured == ['https://example.com/a']
+    assert json.loads(json_path.read_text())[key]['pdf'] == 't1.pdf'
+
+
 def test_download_missing_pdfs_passes_journal(monkeypatch, tmp_path):
     data = {
         '1': {'title': 't1', 'link': 'L1', 'journal': 'Nature Communications'},
@@ -842,6 +1106,21 @@ def test_download_journal_pdfs(monkeypatch, tmp_path):
     assert stored['1']['download_successful'] is True
 
 
+def test_download_journal_pdfs_parses_store_once(monkeypatch, tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({'1': {'title': 't1', 'journal': 'Aging Cell', 'pdf': 't1.pdf'}}))
+
+    parses = []
+    real_parse = fft._parse_store
+    monkeypatch.setattr(fft, '_parse_store', lambda raw: (parses.append(raw), real_parse(raw))[1])
+    monkeypatch.setattr(fft, '_download_pdf', lambda *a, **k: pytest.fail('nothing is pending'))
+
+    fft.download_journal_pdfs('Aging Cell', json_path=json_path)
+    assert len(parses) == 1
+    fft.download_journal_pdfs('Aging Cell', json_path=json_path)
+    assert len(parses) == 1
+
+
 def test_download_missing_pdfs_failure(monkeypatch, tmp_path):
     data = {'1': {'title': 't1', 'link': 'L1'}}
     json_path = tmp_path / 'a.json'
@@ -869,21 +1148,21 @@ def test_download_missing_pdfs_handles_non_serializable(monkeypatch, tmp_path):
             self.info = 'bad'
 
     odd = Odd()
-    original_load = json.load
-    load_calls = {'count': 0}
+    original_parse = fft._parse_store
+    parse_calls = {'count': 0}
 
-    def fake_load(fh, *args, **kwargs):
-        if load_calls['count'] == 0:
-            load_calls['count'] += 1
+    def fake_parse(raw):
+        if parse_calls['count'] == 0:
+            parse_calls['count'] += 1
             return {'1': {'title': 't1', 'link': 'L1', 'weird': odd}}
-        return original_load(fh, *args, **kwargs)
+        return original_parse(raw)
 
     def fake_download(entry, dest):
         p = dest / f"{entry.title}.pdf"
         p.write_bytes(b'd')
         return p
 
-    monkeypatch.setattr(fft.json, 'load', fake_load)
+    monkeypatch.setattr(fft, '_parse_store', fake_parse)
     monkeypatch.setattr(fft, '_download_pdf', fake_download)
     monkeypatch.setattr(fft, '_discover_doi', lambda *a, **k: '')
     monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
@@ -1008,6 +1287,7 @@ def test_extract_doi_from_url_ignores_citation_reference(monkeypatch):
             return 'http://example.com'
 
     monkeypatch.setattr(fft.urllib.request, 'urlopen', lambda url: Resp(html))
+    fft._PAGE_MEMO.clear()
 
     doi = fft._extract_doi_from_url('http://example.com')
     assert doi == 'https://doi.org/10.5555/main.doi'
@@ -1163,8 +1443,10 @@ def test_fetch_pdf_for_doi(monkeypatch, tmp_path):
     assert called == [("x.pdf", tmp_path)]
 
     stored = json.loads(json_path.read_text())
-    assert list(stored) == ["https://doi.org/10.1234/abc"]
-    data = stored["https://doi.org/10.1234/abc"]
+    key = fft._article_key("https://doi.org/10.1234/abc")
+    assert list(stored) == [key]
+    data = stored[key]
+    assert data["id"] == "https://doi.org/10.1234/abc"
     assert data["pdf"] == "x.pdf"
     assert data["download_successful"] is True
 
@@ -1215,8 +1497,9 @@ def test_fetch_pdf_for_doi_prefixes(monkeypatch, tmp_path):
         assert called[-1] == ("x.pdf", tmp_path)
 
     stored = json.loads(json_path.read_text())
-    assert list(stored) == ["https://doi.org/10.1234/abc"]
-    assert stored["https://doi.org/10.1234/abc"]["download_successful"] is True
+    key = fft._article_key("https://doi.org/10.1234/abc")
+    assert list(stored) == [key]
+    assert stored[key]["download_successful"] is True
 
 
 def test_fetch_pdf_for_doi_existing_item(monkeypatch, tmp_path):
@@ -1324,7 +1607,7 @@ def test_fetch_pdf_for_doi_extracts_abstract(monkeypatch, tmp_path):
     assert out == tmp_path / "x.pdf"
 
     stored = json.loads(json_path.read_text())
-    data = stored["https://doi.org/10.1234/abc"]
+    data = stored[fft._article_key("https://doi.org/10.1234/abc")]
     assert data["abstract"] == "This is the abstract."
 
 
@@ -1366,14 +1649,6 @@ def test_fetch_pdf_for_doi_runs_analysis(monkeypatch, tmp_path):
 
     monkeypatch.setattr(fft, "ocr_pdf", fake_ocr)
 
-    class FakeResp1:
-        class choice:
-            def __init__(self, text):
-                self.message = types.SimpleNamespace(content=text)
-
-        def __init__(self, text):
-            self.choices = [self.choice(text)]
-
     class FakeClient:
         def __init__(self):
             self.calls = []
@@ -1384,8 +1659,8 @@ def test_fetch_pdf_for_doi_runs_analysis(monkeypatch, tmp_path):
         def create(self, **k):
             self.calls.append(k)
             if len(self.calls) == 1:
-                return FakeResp1("This is the abstract.")
-            return FakeResp1("ANALYSIS")
+                return _chat_reply("This is the abstract.", k.get("stream"))
+            return _chat_reply("ANALYSIS", k.get("stream"))
 
     client = FakeClient()
     monkeypatch.setattr(fft, "openai", types.SimpleNamespace(OpenAI=lambda: client))
@@ -1422,14 +1697,12 @@ def test_analyze_article_updates_scores(monkeypatch, tmp_path):
         "[[SECTION 1]]\n<<lt-relevance: 4>>\n\n[[SECTION 2]]\n<<mt-relevance: 3>>\n\n[[SECTION 3]]\n<<st-relevance: 7>>"
     )
 
-    class FakeResp:
-        def __init__(self):
-            self.choices = [types.SimpleNamespace(message=types.SimpleNamespace(content=analysis_text))]
-
     class FakeClient:
         def __init__(self):
             self.chat = types.SimpleNamespace(
-                completions=types.SimpleNamespace(create=lambda **k: FakeResp())
+                completions=types.SimpleNamespace(
+                    create=lambda **k: _chat_reply(analysis_text, k.get("stream"))
+                )
             )
 
     monkeypatch.setattr(fft, "openai", types.SimpleNamespace(OpenAI=lambda: FakeClient()))
@@ -1495,14 +1768,6 @@ def test_design_experiment_for_file(monkeypatch, tmp_path):
 
     calls = []
 
-    class FakeResp:
-        class choice:
-            def __init__(self, text):
-                self.message = types.SimpleNamespace(content=text)
-
-        def __init__(self, text):
-            self.choices = [self.choice(text)]
-
     class FakeClient:
         def __init__(self):
             self.chat = types.SimpleNamespace(
@@ -1511,7 +1776,7 @@ def test_design_experiment_for_file(monkeypatch, tmp_path):
 
         def create(self, **k):
             calls.append(k)
-            return FakeResp("DESIGN")
+            return _chat_reply("DESIGN", k.get("stream"))
 
     monkeypatch.setattr(fft, "openai", types.SimpleNamespace(OpenAI=lambda: FakeClient()))
 
@@ -1788,3 +2053,1029 @@ def test_schematize_experiment_multidot(monkeypatch, tmp_path):
     schema_out = tmp_path / "doiorg10.1038_s41467-019-13036-1.schema.txt"
     assert schema_out.read_text() == "ROW"
 
+
+
+def test_openai_client_is_shared(monkeypatch):
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(fft, 'openai', types.SimpleNamespace(OpenAI=factory))
+    first = fft._openai_client()
+    assert fft._openai_client() is first
+    assert len(created) == 1
+
+
+def test_pdf_url_template_roundtrip():
+    template = fft._pdf_url_template(
+        'https://www.nature.com/articles/s41467-025-1',
+        'https://www.nature.com/articles/s41467-025-1.pdf',
+    )
+    assert template == 'https://www.nature.com{PATH}.pdf'
+    assert (
+        fft._fill_pdf_url_template(template, 'https://www.nature.com/articles/s43587-2')
+        == 'https://www.nature.com/articles/s43587-2.pdf'
+    )
+
+    query_template = fft._pdf_url_template(
+        'https://journals.example.org/one/article?id=10.1/x',
+        'https://journals.example.org/one/article/file?id=10.1/x&type=printable',
+    )
+    assert query_template == (
+        'https://journals.example.org{PATH}/file?{QUERY}&type=printable'
+    )
+    assert fft._fill_pdf_url_template(query_template, 'https://journals.example.org/a') == ''
+
+    assert fft._pdf_url_template('https://a.com/x', 'https://cdn.a.com/x.pdf') == ''
+    assert fft._pdf_url_template('https://a.com/x', 'https://a.com/download/123') == ''
+
+
+def test_read_response_decodes_gzip():
+    import gzip
+
+    class Resp:
+        headers = {'Content-Encoding': 'gzip'}
+
+        def read(self):
+            return gzip.compress(b'<html>hi</html>')
+
+    assert fft._read_response(Resp()) == b'<html>hi</html>'
+    assert 'gzip' in fft._HTTP_HEADERS['Accept-Encoding']
+
+
+def test_llm_shell_commands_rejects_non_http(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(fft.subprocess, 'run', lambda *a, **k: calls.append(a))
+    monkeypatch.setattr(fft, 'openai', types.SimpleNamespace(OpenAI=lambda: object()))
+
+    class E:
+        link = 'file:///etc/passwd'
+        title = 't'
+
+    assert fft._llm_shell_commands(E(), tmp_path) == ''
+    assert calls == []
+
+
+def test_compact_articles_recovers_journal(tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({'old': {'title': 'O'}}))
+    journal = fft._RunJournal(json_path)
+    journal.append('new', {'title': 'N'})
+    with journal.path.open('a') as fh:
+        fh.write('{"torn": ')
+
+    # A run still holding its journal is not disturbed.
+    assert fft._compact_articles(json_path) == 0
+    assert journal.path.exists()
+
+    journal.close()
+    assert fft._compact_articles(json_path) == 1
+    stored = json.loads(json_path.read_text())
+    assert set(stored) == {'old', 'new'}
+    assert fft._journal_paths(json_path) == []
+    assert fft._compact_articles(json_path) == 0
+
+
+def test_fetch_recent_articles_clears_journal(monkeypatch, tmp_path):
+    opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
+
+    class Parsed:
+        def __init__(self, entries):
+            self.entries = entries
+
+    class E(dict):
+        def __init__(self):
+            super().__init__()
+            self.published_parsed = time.gmtime(time.time())
+            self['title'] = 'T'
+            self['link'] = 'L'
+            self['id'] = 'ID'
+            self['summary'] = ''
+            self.link = 'L'
+            self.title = 'T'
+
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: Parsed([E()]))
+    json_path = tmp_path / 'a.json'
+    journal = fft._RunJournal(json_path)
+    journal.append('crashed', {'title': 'C'})
+    journal.close()
+
+    fft.fetch_recent_articles(opml, hours=1, json_path=json_path, download_pdfs=False)
+    stored = json.loads(json_path.read_text())
+    assert set(stored) == {'crashed', fft._article_key('ID')}
+    assert fft._journal_paths(json_path) == []
+
+
+def test_parallel_map_preserves_order():
+    import threading
+
+    seen = set()
+
+    def work(n):
+        seen.add(threading.get_ident())
+        fft.time.sleep(0.01 * (5 - n))
+        return n * n
+
+    assert fft._parallel_map(work, range(5), workers=5) == [0, 1, 4, 9, 16]
+    assert len(seen) > 1
+    assert fft._parallel_map(work, []) == []
+
+
+def test_fetch_url_cached_shares_page(monkeypatch):
+    html = (
+        '<meta name="citation_doi" content="10.5555/shared" />'
+        '<meta name="citation_journal_title" content="Shared J" />'
+    )
+    opened = []
+
+    class Resp:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            pass
+
+        def read(self):
+            return html.encode()
+
+        def geturl(self):
+            return 'https://pub.example/a'
+
+    def fake_urlopen(req):
+        opened.append(req.full_url)
+        return Resp()
+
+    monkeypatch.setattr(fft.urllib.request, 'urlopen', fake_urlopen)
+    fft._PAGE_MEMO.clear()
+
+    assert fft._extract_doi_from_url('https://pub.example/a') == 'https://doi.org/10.5555/shared'
+    assert fft._extract_journal_from_url('https://pub.example/a') == 'Shared J'
+    assert opened == ['https://pub.example/a']
+    fft._PAGE_MEMO.clear()
+
+
+def test_fetch_url_cached_memo_is_bounded(monkeypatch):
+    opened = []
+
+    class Resp:
+        def __init__(self, url):
+            self.url = url
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            pass
+
+        def read(self):
+            return b'page'
+
+        def geturl(self):
+            return self.url
+
+    def fake_urlopen(req):
+        opened.append(req.full_url)
+        return Resp(req.full_url)
+
+    clock = [0.0]
+    monkeypatch.setattr(fft.urllib.request, 'urlopen', fake_urlopen)
+    monkeypatch.setattr(fft.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(fft, '_PAGE_MEMO_SIZE', 2)
+    fft._PAGE_MEMO.clear()
+
+    for url in ('https://pub.example/a', 'https://pub.example/b', 'https://pub.example/c'):
+        fft._fetch_url_cached(url)
+    assert list(fft._PAGE_MEMO) == ['https://pub.example/b', 'https://pub.example/c']
+
+    fft._fetch_url_cached('https://pub.example/c')
+    assert len(opened) == 3
+    clock[0] = fft._PAGE_MEMO_TTL
+    fft._fetch_url_cached('https://pub.example/c')
+    assert len(opened) == 4
+    fft._PAGE_MEMO.clear()
+
+
+def test_html_links_only_keeps_anchor_text():
+    html = (
+        '<html><head><title>x</title></head><body><p>intro '
+        '<a class="c" href=\'https://a.example/1?x=1&amp;y=2\'><b>First</b> link</a>'
+        ' tail <a name="anchor">No href</a><div><a href=/pdf>PDF'
+        '</div></body></html>'
+    )
+    assert fft._html_links_only(html) == (
+        '<a href="https://a.example/1?x=1&y=2">First link</a>\n'
+        '<a>No href</a>\n'
+        '<a href="/pdf">PDF</a>'
+    )
+
+
+def test_html_links_only_dumps_only_when_debugging(monkeypatch, tmp_path):
+    written = []
+    monkeypatch.setattr(fft.Path, 'write_text', lambda self, *a, **k: written.append(self))
+
+    monkeypatch.setattr(fft, '_DEBUG_HTML', False)
+    fft._html_links_only('<a href="https://x.example">x</a>')
+    assert written == []
+
+    monkeypatch.setattr(fft, '_DEBUG_HTML', True)
+    fft._html_links_only('<a href="https://x.example">x</a>')
+    assert [p.name.split('_')[1] for p in written] == ['before', 'after']
+
+
+def test_download_missing_pdfs_saves_once(monkeypatch, tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({str(i): {'title': f't{i}', 'link': f'L{i}'} for i in range(3)}))
+
+    def fake_download(entry, dest):
+        p = dest / f"{entry.title}.pdf"
+        p.write_bytes(b'd')
+        return p
+
+    saves = []
+    real_save = fft._save_articles
+    monkeypatch.setattr(fft, '_save_articles', lambda a, p: (saves.append(p), real_save(a, p)))
+    monkeypatch.setattr(fft, '_download_pdf', fake_download)
+    monkeypatch.setattr(fft, '_discover_doi', lambda *a, **k: '')
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft.time, 'sleep', lambda *a, **k: None)
+    monkeypatch.setattr(fft.random, 'uniform', lambda *a, **k: 0)
+
+    fft.download_missing_pdfs(json_path=json_path)
+
+    assert saves == [json_path]
+    stored = json.loads(json_path.read_text())
+    assert [stored[str(i)]['pdf'] for i in range(3)] == ['t0.pdf', 't1.pdf', 't2.pdf']
+    assert fft._journal_paths(json_path) == []
+
+
+def test_download_missing_pdfs_recovers_journal(monkeypatch, tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({'k': {'title': 't', 'link': 'L'}}))
+    journal = fft._RunJournal(json_path)
+    journal.append('k', {'title': 't', 'link': 'L', 'pdf': 't.pdf'})
+    journal.close()
+    monkeypatch.setattr(fft, '_download_pdf', lambda *a, **k: pytest.fail('downloaded again'))
+
+    fft.download_missing_pdfs(json_path=json_path)
+
+    assert json.loads(json_path.read_text())['k']['pdf'] == 't.pdf'
+    assert fft._journal_paths(json_path) == []
+
+
+def test_open_url_reuses_connection():
+    import http.server
+    import threading
+
+    peers = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            peers.append(self.client_address)
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f'http://127.0.0.1:{server.server_port}'
+        for path in ('/a', '/b', '/c'):
+            with fft._open_url(base + path) as resp:
+                assert fft._read_response(resp) == path.encode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(peers) == 3
+    assert len(set(peers)) == 1
+
+
+def test_determine_effective_url_prefers_canonical():
+    html = (
+        '<meta property="og:url" content="https://pub.example/og">'
+        '<meta http-equiv="refresh" content="0; url=/moved">'
+        '<link rel="canonical" href="/article/1">'
+    )
+    assert (
+        fft._determine_effective_url('https://doi.org/10.1/x', 'https://pub.example/a', html)
+        == 'https://pub.example/article/1'
+    )
+    assert (
+        fft._determine_effective_url('https://doi.org/10.1/x', '', '<meta http-equiv="refresh" content="0; url=https://pub.example/moved">')
+        == 'https://pub.example/moved'
+    )
+
+
+def test_browse_fetch_follows_redirects_with_cookies(monkeypatch, tmp_path):
+    import http.server
+    import threading
+
+    seen_cookies = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path == '/landing':
+                self.send_response(302)
+                self.send_header('Location', '/paper.pdf')
+                self.send_header('Set-Cookie', 'session=abc; Path=/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            seen_cookies.append(self.headers.get('Cookie'))
+            if self.path == '/paper.pdf':
+                body, ctype, status = b'%PDF-1.4 data', 'application/pdf', 200
+            else:
+                body, ctype, status = b'<html>denied</html>', 'text/html; charset=utf-8', 403
+            self.send_response(status)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    monkeypatch.setenv('PDF_FETCH_COOKIE_JAR', str(tmp_path / 'missing.cookies'))
+    monkeypatch.setattr(fft, '_BROWSE_OPENER', None)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f'http://127.0.0.1:{server.server_port}'
+        data, ctype, final = fft._browse_fetch(base + '/landing')
+        assert (data, ctype, final) == (b'%PDF-1.4 data', 'application/pdf', base + '/paper.pdf')
+        data, ctype, final = fft._browse_fetch(base + '/other')
+        assert (data, ctype) == (b'<html>denied</html>', 'text/html')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert seen_cookies == ['session=abc', 'session=abc']
+
+
+def test_browse_fetch_caps_pages_but_not_pdfs(monkeypatch, tmp_path):
+    import gzip
+    import http.server
+    import threading
+
+    page = b'<a href="/p.pdf">PDF</a>' + b'x' * 50_000
+    pdf = b'%PDF-1.4 ' + b'y' * 50_000
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path == '/p.pdf':
+                body, headers = pdf, {'Content-Type': 'application/octet-stream'}
+            else:
+                body = gzip.compress(page, compresslevel=0)
+                headers = {'Content-Type': 'text/html', 'Content-Encoding': 'gzip'}
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    monkeypatch.setenv('PDF_FETCH_COOKIE_JAR', str(tmp_path / 'missing.cookies'))
+    monkeypatch.setattr(fft, '_BROWSE_OPENER', None)
+    monkeypatch.setattr(fft, '_BROWSE_PAGE_LIMIT', 1000)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f'http://127.0.0.1:{server.server_port}'
+        data, ctype, _ = fft._browse_fetch(base + '/article')
+        assert ctype == 'text/html'
+        assert data.startswith(b'<a href="/p.pdf">PDF</a>')
+        assert len(data) < 1000
+        data, _, _ = fft._browse_fetch(base + '/p.pdf')
+        assert data == pdf
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_html_links_only_handles_unclosed_anchors_quickly():
+    html = '<a href="https://x.example/a">' + ('text <b>bold</b> ' * 20_000) + '<a href="/b">B'
+    start = fft.time.perf_counter()
+    result = fft._html_links_only(html)
+    assert fft.time.perf_counter() - start < 2
+    lines = result.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('<a href="https://x.example/a">text bold')
+    assert lines[1] == '<a href="/b">B</a>'
+
+
+class _FakeResponse:
+    status = 200
+    reason = 'OK'
+    will_close = False
+
+    def __init__(self):
+        self.msg = fft.http.client.HTTPMessage()
+
+    def read(self, *args):
+        return b'body'
+
+
+def _fake_connection_class(first_error):
+    opened = []
+
+    class Conn:
+        def __init__(self, host, timeout=None, **kwargs):
+            self.error = first_error if not opened else None
+            opened.append(self)
+
+        def request(self, *args, **kwargs):
+            pass
+
+        def getresponse(self):
+            if self.error:
+                raise self.error
+            return _FakeResponse()
+
+        def close(self):
+            pass
+
+    return Conn, opened
+
+
+def _pooled_request(handler, conn_class, method):
+    req = fft.urllib.request.Request('http://pub.example/a', method=method)
+    req.timeout = 5
+    return handler._pooled_open(conn_class, req)
+
+
+@pytest.mark.parametrize('error', [
+    fft.http.client.RemoteDisconnected('closed'),
+    BrokenPipeError(),
+    ConnectionResetError(),
+])
+def test_pooled_open_retries_stale_idempotent_requests(monkeypatch, error):
+    monkeypatch.setattr(fft._HTTP_POOL, 'connections', {}, raising=False)
+    conn_class, opened = _fake_connection_class(error)
+    handler = fft._KeepAliveHTTPHandler()
+    fft._HTTP_POOL.connections[('Conn', 'pub.example')] = conn_class('pub.example')
+
+    assert _pooled_request(handler, conn_class, 'GET').read() == b'body'
+    assert len(opened) == 2
+
+
+@pytest.mark.parametrize('method, error', [
+    ('POST', fft.http.client.RemoteDisconnected('closed')),
+    ('GET', TimeoutError('timed out')),
+])
+def test_pooled_open_does_not_retry_unsafe_failures(monkeypatch, method, error):
+    monkeypatch.setattr(fft._HTTP_POOL, 'connections', {}, raising=False)
+    conn_class, opened = _fake_connection_class(error)
+    handler = fft._KeepAliveHTTPHandler()
+    fft._HTTP_POOL.connections[('Conn', 'pub.example')] = conn_class('pub.example')
+
+    with pytest.raises(fft.urllib.error.URLError):
+        _pooled_request(handler, conn_class, method)
+    assert len(opened) == 1
+
+
+def test_http_disk_cache_roundtrip(monkeypatch, tmp_path):
+    db = tmp_path / 'cache.sqlite'
+    monkeypatch.setattr(fft, '_HTTP_CACHE_DB', db)
+    assert fft._http_cache_get('https://pub.example/a') is None
+    fft._http_cache_put('https://pub.example/a', 'https://pub.example/b', 'page')
+    assert fft._http_cache_get('https://pub.example/a') == ('https://pub.example/b', 'page')
+
+    def no_network(req):
+        raise AssertionError('network used')
+
+    monkeypatch.setattr(fft.urllib.request, 'urlopen', no_network)
+    fft._PAGE_MEMO.clear()
+    assert fft._fetch_url_cached('https://pub.example/a') == ('https://pub.example/b', 'page')
+    fft._PAGE_MEMO.clear()
+
+    later = fft.time.time() + fft._HTTP_CACHE_TTL.total_seconds() + 1
+    monkeypatch.setattr(fft.time, 'time', lambda: later)
+    assert fft._http_cache_get('https://pub.example/a') is None
+
+
+def test_crossref_json_caches_hits_and_404s(monkeypatch, tmp_path):
+    monkeypatch.setattr(fft, '_HTTP_CACHE_DB', tmp_path / 'cache.sqlite')
+    calls = []
+
+    class Resp(io.BytesIO):
+        headers = {}
+
+    def fake_urlopen(req):
+        calls.append(req.full_url)
+        if req.full_url.endswith('missing'):
+            raise fft.urllib.error.HTTPError(req.full_url, 404, 'Not Found', {}, None)
+        return Resp(b'{"message": {"title": ["T"]}}')
+
+    monkeypatch.setattr(fft.urllib.request, 'urlopen', fake_urlopen)
+
+    for _ in range(2):
+        assert fft._crossref_json('https://api.crossref.org/works/found') == {'message': {'title': ['T']}}
+        assert fft._crossref_json('https://api.crossref.org/works/missing') == {}
+    assert len(calls) == 2
+
+
+def test_debug_formats_only_when_enabled(monkeypatch, capsys):
+    class Loud:
+        def __format__(self, spec):
+            raise AssertionError('formatted while disabled')
+
+    monkeypatch.setattr(fft, '_DEBUG', False)
+    fft._debug('value {v}', v=Loud())
+    assert capsys.readouterr().out == ''
+
+    monkeypatch.setattr(fft, '_DEBUG', True)
+    fft._debug('value {v}', v=3)
+    assert capsys.readouterr().out.rstrip().endswith('] value 3')
+
+
+def test_publisher_pacer_spaces_same_publisher_only(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(fft.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(fft.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(fft.random, 'uniform', lambda a, b: 7.0)
+
+    pacer = fft._PublisherPacer()
+    pacer.wait('nature')
+    pacer.wait('cell')
+    pacer.wait('nature')
+    pacer.wait('nature')
+
+    assert sleeps == [7.0, 14.0]
+
+
+def test_download_missing_pdfs_batches_journal_lookups(monkeypatch, tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({
+        str(i): {'title': f't{i}', 'link': f'L{i}', 'doi': f'https://doi.org/10.1/X{i}'}
+        for i in range(25)
+    }))
+    urls = []
+
+    def fake_crossref(url):
+        urls.append(url)
+        return {'message': {'items': [{'DOI': '10.1/X3', 'container-title': ['Aging Cell']}]}}
+
+    seen = {}
+
+    def fake_download(entry, dest):
+        seen[entry.title] = entry.journal
+        return None
+
+    monkeypatch.setattr(fft, '_crossref_json', fake_crossref)
+    monkeypatch.setattr(fft, '_download_pdf', fake_download)
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft.time, 'sleep', lambda *a, **k: None)
+    monkeypatch.setattr(fft.random, 'uniform', lambda *a, **k: 0)
+
+    fft.download_missing_pdfs(json_path=json_path)
+
+    assert len(urls) == 2
+    assert 'doi:10.1/x0,doi:10.1/x1,' in urls[0]
+    assert seen['t3'] == 'Aging Cell' and seen['t4'] == ''
+    assert json.loads(json_path.read_text())['3']['journal'] == 'Aging Cell'
+
+
+def test_load_articles_cached_rereads_only_changed_store(monkeypatch, tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({'1': {'title': 't', 'journal': 'Cell'}}))
+    parses = []
+    real_parse = fft._parse_store
+    monkeypatch.setattr(fft, '_parse_store', lambda raw: (parses.append(1), real_parse(raw))[1])
+
+    assert fft.pending_journal_articles('cell', json_path=json_path)
+    assert fft.journals_with_pending_articles(json_path=json_path) == {'cell': 'Cell'}
+    assert len(parses) == 1
+
+    fft._save_articles({'1': {'title': 't', 'journal': 'Cell', 'pdf': 't.pdf'}}, json_path)
+    assert not fft.pending_journal_articles('cell', json_path=json_path)
+
+
+def test_journal_index_groups_keys_by_journal(tmp_path):
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({
+        '1': {'journal': 'Aging Cell '},
+        '2': {'journal': 'Cell'},
+        '3': {'journal': 'aging cell', 'pdf': 'x.pdf'},
+        '4': {'journal': None},
+    }))
+
+    assert fft._journal_index(json_path) == {'aging cell': ['1', '3'], 'cell': ['2']}
+    assert fft.journals_with_pending_articles(json_path=json_path) == {
+        'aging cell': 'Aging Cell',
+        'cell': 'Cell',
+    }
+
+
+def test_ocr_pdf_fallback_reads_text_layer(monkeypatch, tmp_path):
+    pymupdf = pytest.importorskip('pymupdf')
+    pdf_path = tmp_path / 't.pdf'
+    with pymupdf.open() as doc:
+        doc.new_page().insert_text((72, 72), 'Senolytic results')
+        doc.save(str(pdf_path))
+    monkeypatch.setattr(fft, '_cleanup_ocr_text', lambda text: text.upper())
+
+    out = fft._ocr_pdf_fallback(pdf_path, pdf_path.with_suffix('.txt'))
+
+    assert 'SENOLYTIC RESULTS' in out.read_text()
+    assert not pdf_path.with_suffix('.zip').exists()
+
+
+def test_stream_chat_joins_deltas():
+    def chunk(text):
+        delta = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return iter([chunk('Sec'), chunk(None), types.SimpleNamespace(choices=[]), chunk('tion')])
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+
+    assert fft._stream_chat(client, model='m', messages=[]) == 'Section'
+    assert calls == [{'stream': True, 'model': 'm', 'messages': []}]
+
+
+def test_design_experiments_from_analyses_runs_designs_concurrently(monkeypatch, tmp_path):
+    import threading
+
+    for name in ('a', 'b'):
+        (tmp_path / f'{name}.txt').write_text('TXT')
+        (tmp_path / f'{name}.analysis.txt').write_text('analysis')
+    monkeypatch.setattr(fft, '_ARTICLES_JSON', tmp_path / 'missing.json')
+    # Each design waits for the other, so a sequential loop would time out.
+    barrier = threading.Barrier(2, timeout=5)
+    monkeypatch.setattr(fft, 'design_experiment_for_file', lambda p, char_file=None: barrier.wait())
+    monkeypatch.setattr(fft, 'schematize_experiment', lambda p: None)
+
+    out = fft.design_experiments_from_analyses(pdf_dir=tmp_path)
+
+    assert sorted(p.name for p in out) == ['a.txt', 'b.txt']
+
+
+def test_load_char_file_reparses_only_after_edit(tmp_path):
+    char_path = tmp_path / 'c.yaml'
+    char_path.write_text('prompts: {brain: {designer_preamble: one}}')
+    first = fft._load_char_file(char_path)
+    assert fft._load_char_file(char_path) is first
+
+    char_path.write_text('prompts: {brain: {designer_preamble: two}}')
+    os.utime(char_path, ns=(0, char_path.stat().st_mtime_ns + 1))
+    assert fft._load_char_file(char_path)['prompts']['brain']['designer_preamble'] == 'two'
+
+
+def test_parse_feed_options_are_per_call():
+    feed = (
+        '<rss version="2.0"><channel><link>https://pub.example/</link>'
+        '<item><title>T</title><description>&lt;a href="/x"&gt;x&lt;/a&gt;'
+        '&lt;script&gt;s&lt;/script&gt;</description></item></channel></rss>'
+    )
+    parsed = fft._parse_feed(feed, None)
+    assert parsed.entries[0].summary == '<a href="/x">x</a><script>s</script>'
+    assert fft._fp.SANITIZE_HTML
+    assert fft._fp.RESOLVE_RELATIVE_URIS
+
+
+def test_fetch_recent_articles_skips_unchanged_feeds(monkeypatch, tmp_path):
+    opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
+    json_path = tmp_path / 'a.json'
+    calls = []
+
+    def fake_parse(url, etag=None, modified=None, **kw):
+        calls.append((etag, modified))
+        if etag == 'v1':
+            return types.SimpleNamespace(status=304, entries=[])
+        entry = fft._fp.FeedParserDict(
+            title='T', link='L', id='ID', summary='', published_parsed=time.gmtime()
+        )
+        return types.SimpleNamespace(status=200, etag='v1', modified=None, entries=[entry])
+
+    monkeypatch.setattr(fft._fp, 'parse', fake_parse)
+
+    first = fft.fetch_recent_articles(opml, hours=24, json_path=json_path, download_pdfs=False)
+    second = fft.fetch_recent_articles(opml, hours=24, json_path=json_path, download_pdfs=False)
+    # A longer window than the last read cannot trust the validators.
+    fft.fetch_recent_articles(opml, hours=24 * 7, json_path=json_path, download_pdfs=False)
+
+    assert calls == [(None, None), ('v1', None), (None, None)]
+    assert fft._article_key('ID') in first and second == {}
+    assert fft._article_key('ID') in json.loads(json_path.read_text())
+
+
+def test_fetch_recent_articles_survives_failing_feed(monkeypatch):
+    opml = (
+        '<opml><body><outline type="rss" xmlUrl="http://bad" title="B"/>'
+        '<outline type="rss" xmlUrl="http://good" title="G"/></body></opml>'
+    )
+
+    def fake_parse(url, **kw):
+        if url == 'http://bad':
+            raise ValueError('boom')
+        entry = fft._fp.FeedParserDict(
+            title='T', link='L', id='ID', summary='', published_parsed=time.gmtime()
+        )
+        return types.SimpleNamespace(entries=[entry])
+
+    monkeypatch.setattr(fft._fp, 'parse', fake_parse)
+
+    articles = fft.fetch_recent_articles(opml, hours=1, json_path=None, download_pdfs=False)
+
+    assert articles[fft._article_key('ID')]['rsstitle'] == 'G'
+
+
+def test_summarize_articles_condenses_papers_over_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(fft, '_tiktoken', None)
+    monkeypatch.setattr(fft, '_SUMMARY_CHUNK_TOKENS', 20)
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({
+        str(i): {'title': f'Paper {i}', 'abstract': 'x' * 40} for i in range(3)
+    }))
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs['messages'])
+        content = 'digest' if len(prompts) <= 3 else 'final'
+        return _chat_reply(content, kwargs.get('stream'))
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(fft, '_openai_client', lambda: client)
+
+    summary = fft.summarize_articles(json_path=json_path, char_file=tmp_path / 'missing.yaml')
+
+    assert summary == 'final'
+    assert len(prompts) == 4
+    assert prompts[-1][0]['content'] == 'PAPERS\ndigest\ndigest\ndigest\n******'
+    assert fft._truncate_tokens('abcdefghij', 2) == 'abcdefgh'
+
+
+def test_scratch_parent_avoids_cross_device_moves(monkeypatch, tmp_path):
+    local = tmp_path / 'local'
+    other = tmp_path / 'other'
+    final = tmp_path / 'final'
+    for d in (local, other, final):
+        d.mkdir()
+    devices = {str(local): 1, str(final): 1, str(other): 2}
+    monkeypatch.setattr(fft.os, 'stat', lambda p: types.SimpleNamespace(st_dev=devices[str(p)]))
+
+    scratch_parent = fft._scratch_parent.__wrapped__
+    assert scratch_parent(local, final) == local
+    assert scratch_parent(other, final) == final
+
+
+def test_wellplate_sql_helpers():
+    sql = (
+        "ALTER TABLE trialsv2db ADD COLUMN dose VARCHAR(10);\n"
+        "insert into trialsv2db(drug, dose) values ('a', '1'), ('b', '2');"
+    )
+    rows = fft._extract_rows(sql)
+    assert rows == [
+        "insert into trialsv2db(drug, dose) VALUES ('a', '1')",
+        "insert into trialsv2db(drug, dose) VALUES ('b', '2')",
+    ]
+    assert fft._extract_alters(sql) == ['ALTER TABLE trialsv2db ADD COLUMN dose VARCHAR(10)']
+    row = fft._append_column_value(rows[0], 'status', "'pending'")
+    assert fft._backtick_columns(row) == (
+        "insert into trialsv2db(`drug`, `dose`, `status`) VALUES ('a', '1', 'pending')"
+    )
+    assert fft._backtick_columns(fft._extract_alters(sql)[0]).startswith(
+        'ALTER TABLE trialsv2db ADD COLUMN `dose` '
+    )
+
+
+def test_extract_rows_respects_quotes_and_nesting():
+    sql = (
+        "Here's the SQL:\n"
+        "INSERT INTO trialsv2db (drug, note) VALUES ('rapa', 'dose; low (1mg)'), ('met', NOW());\n"
+        "reinsert into trialsv2db values (1);"
+    )
+    assert fft._extract_rows(sql) == [
+        "INSERT INTO trialsv2db (drug, note) VALUES ('rapa', 'dose; low (1mg)')",
+        "INSERT INTO trialsv2db (drug, note) VALUES ('met', NOW())",
+    ]
+
+
+def test_wellplate_reuses_parsed_schemas(monkeypatch, tmp_path):
+    for suffix in ('.txt', '.analysis.txt', '.exp.txt'):
+        (tmp_path / f'a{suffix}').write_text('x')
+    (tmp_path / 'a.schema.txt').write_text('INSERT INTO trialsv2db(foo) VALUES (1);')
+    monkeypatch.setattr(fft, '_ARTICLES_JSON', tmp_path / 'missing.json')
+    parses = []
+    real_extract = fft._extract_rows
+    monkeypatch.setattr(fft, '_extract_rows', lambda sql: parses.append(sql) or real_extract(sql))
+
+    fft.design_experiments_from_analyses(pdf_dir=tmp_path)
+    wellplate = next(tmp_path.glob('*_wellplate.txt'))
+    first = wellplate.read_text()
+    wellplate.unlink()
+    fft.design_experiments_from_analyses(pdf_dir=tmp_path)
+
+    assert len(parses) == 1
+    assert next(tmp_path.glob('*_wellplate.txt')).read_text() == first
+    assert "VALUES (1, 'pending', 'A1');" in first
+
+
+def test_wellplate_skips_schema_that_overflows(monkeypatch, tmp_path):
+    for stem in ('a', 'b'):
+        for suffix in ('.txt', '.analysis.txt', '.exp.txt'):
+            (tmp_path / f'{stem}{suffix}').write_text('x')
+    (tmp_path / 'a.schema.txt').write_text(
+        'ALTER TABLE trialsv2db ADD COLUMN big INT;\n'
+        + ''.join(f'INSERT INTO trialsv2db(foo) VALUES ({i});\n' for i in range(13))
+    )
+    (tmp_path / 'b.schema.txt').write_text('INSERT INTO trialsv2db(foo) VALUES (99);')
+    monkeypatch.setattr(fft, '_ARTICLES_JSON', tmp_path / 'missing.json')
+
+    fft.design_experiments_from_analyses(pdf_dir=tmp_path)
+
+    text = next(tmp_path.glob('*_wellplate.txt')).read_text()
+    assert 'big' not in text
+    assert "VALUES (99, 'pending', 'A1');" in text
+    assert 'VALUES (0,' not in text
+
+
+def test_wellplate_scores_shared_stems_by_path(monkeypatch, tmp_path):
+    for stem, value in (('paper', 1), ('z', 2)):
+        for suffix in ('.txt', '.analysis.txt', '.exp.txt'):
+            (tmp_path / f'{stem}{suffix}').write_text('x')
+        (tmp_path / f'{stem}.schema.txt').write_text(
+            f'INSERT INTO trialsv2db(foo) VALUES ({value});'
+        )
+    articles = {
+        'A': {'pdf': 'paper.pdf'},
+        'B': {'pdf': 'old/paper.pdf', 'st-relevance': 3},
+        'C': {'pdf': 'z.pdf', 'lt-relevance': 1},
+    }
+    json_path = tmp_path / 'articles.json'
+    json_path.write_text(json.dumps(articles))
+    monkeypatch.setattr(fft, '_ARTICLES_JSON', json_path)
+
+    fft.design_experiments_from_analyses(pdf_dir=tmp_path)
+
+    text = next(tmp_path.glob('*_wellplate.txt')).read_text()
+    assert "VALUES (2, 'pending', 'A1');" in text
+    assert "VALUES (1, 'pending', 'B1');" in text
+
+
+def test_append_column_value_keeps_nested_values():
+    row = "INSERT INTO trialsv2db (`drug`, `at`) VALUES ('a (b)', NOW())"
+    assert fft._append_column_value(row, '`status`', "'pending'") == (
+        "INSERT INTO trialsv2db(`drug`, `at`, `status`) VALUES ('a (b)', NOW(), 'pending')"
+    )
+    assert fft._append_column_value('DELETE FROM trialsv2db', 'x', '1') == 'DELETE FROM trialsv2db'
+
+
+def test_doi_index_tracks_store(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text(json.dumps({
+        'a': {'doi': 'https://doi.org/10.1/x'},
+        'b': {'doi': 'https://doi.org/10.1/x'},
+        'c': {'title': 'no doi'},
+    }))
+    assert fft._doi_index(path) == {'https://doi.org/10.1/x': 'a'}
+
+    fft._save_articles({'d': {'doi': 'https://doi.org/10.1/y'}}, path)
+    assert fft._doi_index(path)['https://doi.org/10.1/y'] == 'd'
+
+
+def test_fetch_recent_articles_keeps_known_without_downloads(monkeypatch, tmp_path):
+    opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
+
+    class E(dict):
+        def __init__(self, ident):
+            super().__init__(title=ident, link='L', id=ident, summary='')
+            self.published_parsed = time.gmtime(time.time())
+            self.link = 'L'
+            self.title = ident
+
+    parsed = types.SimpleNamespace(entries=[E('OLD'), E('NEW')])
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({fft._article_key('OLD'): {'title': 'OLD', 'lt-relevance': 3}}))
+    built = []
+    real_build = fft._entry_to_article_data
+    monkeypatch.setattr(
+        fft, '_entry_to_article_data', lambda e, **kw: built.append(e.title) or real_build(e, **kw)
+    )
+
+    fft.fetch_recent_articles(opml, hours=1, json_path=json_path, download_pdfs=False)
+
+    assert built == ['NEW']
+    stored = json.loads(json_path.read_text())
+    assert stored[fft._article_key('OLD')]['lt-relevance'] == 3
+    assert fft._article_key('NEW') in stored
+
+
+def test_chat_reply_cached_reuses_identical_prompts(monkeypatch, tmp_path):
+    monkeypatch.setattr(fft, '_HTTP_CACHE_DB', tmp_path / 'cache.sqlite')
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = types.SimpleNamespace(content='https://doi.org/10.1/x')
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    )
+    messages = [{'role': 'user', 'content': 'post'}]
+    for _ in range(2):
+        assert fft._chat_reply_cached(client, model='m', messages=messages) == 'https://doi.org/10.1/x'
+    fft._chat_reply_cached(client, model='m', messages=[{'role': 'user', 'content': 'other'}])
+    assert len(calls) == 2
+
+
+def test_llm_shell_commands_follows_citation_pdf_url(monkeypatch, tmp_path):
+    pages = {
+        'https://pub.example/article': (
+            b'<html><meta name="citation_pdf_url" content="/article.pdf"></html>',
+            'text/html',
+            'https://pub.example/article',
+        ),
+        'https://pub.example/article.pdf': (b'%PDF-1.4 data', 'application/pdf', ''),
+    }
+    fetched = []
+    monkeypatch.setattr(fft, '_browse_fetch', lambda u: fetched.append(u) or pages[u])
+    monkeypatch.setattr(fft, '_pdf_url_templates', lambda: {})
+    monkeypatch.setattr(fft, '_store_pdf_url_template', lambda *a: None)
+    monkeypatch.setattr(fft, 'openai', types.SimpleNamespace(OpenAI=lambda: None))
+    monkeypatch.setenv('PDF_FETCH_BASH', '0')
+    entry = types.SimpleNamespace(link='https://pub.example/article', title='T')
+
+    assert fft._llm_shell_commands(entry, tmp_path).startswith('Downloaded')
+    assert fetched == ['https://pub.example/article', 'https://pub.example/article.pdf']
+    assert list(tmp_path.glob('*.pdf'))
+
+
+def test_fetch_recent_articles_refetches_missing_pdf(monkeypatch, tmp_path):
+    opml = '<opml><body><outline type="rss" xmlUrl="http://feed" title="FT"/></body></opml>'
+
+    class E(dict):
+        def __init__(self, ident):
+            super().__init__(title=ident, link='L', id=ident, summary='')
+            self.published_parsed = time.gmtime(time.time())
+            self.link = 'L'
+            self.title = ident
+
+    parsed = types.SimpleNamespace(entries=[E('GONE')])
+    monkeypatch.setattr(fft._fp, 'parse', lambda url, **kw: parsed)
+    json_path = tmp_path / 'a.json'
+    json_path.write_text(json.dumps({'GONE': {'title': 'GONE', 'pdf': 'gone.pdf'}}))
+    attempts = []
+    monkeypatch.setattr(fft, '_download_pdf', lambda entry, dest: attempts.append(entry.title))
+    monkeypatch.setattr(fft, '_PDF_DIR', tmp_path)
+    monkeypatch.setattr(fft.time, 'sleep', lambda *a, **k: None)
+
+    fft.fetch_recent_articles(opml, hours=1, json_path=json_path, download_pdfs=True)
+    assert attempts == ['GONE']
+
+
+def test_llm_shell_commands_falls_back_when_template_fetch_fails(monkeypatch, tmp_path):
+    landing = 'https://pub.example/article'
+    pages = {
+        landing: (b'<html><a href="https://pub.example/real.pdf">PDF</a></html>', 'text/html', landing),
+        'https://pub.example/real.pdf': (b'%PDF-1.4 data', 'application/pdf', ''),
+    }
+
+    def fake_fetch(u):
+        if u not in pages:
+            raise OSError('timed out')
+        return pages[u]
+
+    stored = []
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs['messages'][-1]['content'])
+        message = types.SimpleNamespace(content='https://pub.example/real.pdf')
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    )
+    monkeypatch.setattr(fft, '_browse_fetch', fake_fetch)
+    monkeypatch.setattr(fft, '_pdf_url_templates', lambda: {'pub.example': 'https://pub.example{PATH}/stale.pdf'})
+    monkeypatch.setattr(fft, '_store_pdf_url_template', lambda host, t: stored.append((host, t)))
+    monkeypatch.setattr(fft, 'openai', types.SimpleNamespace(OpenAI=lambda: client))
+    monkeypatch.setenv('PDF_FETCH_BASH', '0')
+    entry = types.SimpleNamespace(link=landing, title='T')
+
+    assert fft._llm_shell_commands(entry, tmp_path).startswith('Downloaded')
+    assert stored[0] == ('pub.example', None)
+    assert len(prompts) == 1 and 'real.pdf' in prompts[0]
+    assert list(tmp_path.glob('*.pdf'))